@@ -0,0 +1,57 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: memory used by live characters
+
+Compares the old dictionary characters with character_model.Character.
+Run from the project root:  python benchmarks/bench_character_memory.py [count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character_model import Character
+
+def make_dict_character(index):
+    """The character layout create_character() used to return."""
+    return {
+        "name": f"Hero{index}",
+        "class": "Warrior",
+        "level": 1,
+        "experience": 0,
+        "gold": 0,
+        "health": 100,
+        "max_health": 100,
+        "attack": 5,
+        "defense": 2,
+        "inventory": [],
+        "active_quests": [],
+        "completed_quests": []
+    }
+
+def make_slots_character(index):
+    return Character(f"Hero{index}", "Warrior")
+
+def measure(factory, count):
+    """Return bytes allocated while holding count characters."""
+    tracemalloc.start()
+    characters = [factory(index) for index in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del characters
+    return size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    dict_bytes = measure(make_dict_character, count)
+    slots_bytes = measure(make_slots_character, count)
+
+    print(f"{count} characters")
+    print(f"  dict:      {dict_bytes / count:8.1f} bytes/character  ({dict_bytes / 2**20:.1f} MiB)")
+    print(f"  Character: {slots_bytes / count:8.1f} bytes/character  ({slots_bytes / 2**20:.1f} MiB)")
+    print(f"  saved:     {100 * (1 - slots_bytes / dict_bytes):.0f}%")
+
+if __name__ == "__main__":
+    main()
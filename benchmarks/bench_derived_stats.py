@@ -0,0 +1,56 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: combat throughput with cached derived stats
+
+Runs the same stream of combat_system.attack() calls with the cached
+effective stats and with them worked out on every attack.
+Run from the project root:  python benchmarks/bench_derived_stats.py [attacks]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+import derived_stats
+from character_model import Character
+
+def make_fighters():
+    hero = Character("Hero", "Warrior", attack=12, defense=4, strength=5)
+    derived_stats.add_buff(hero, "attack", 2)
+    target = Character("Dummy", "Warrior", defense=3, strength=1)
+    derived_stats.add_buff(target, "defense", 1)
+    return hero, target
+
+def run(attacks):
+    """Return seconds taken for attacks hero -> dummy hits."""
+    hero, target = make_fighters()
+    start = time.perf_counter()
+    for _ in range(attacks):
+        target["health"] = 1_000_000
+        combat_system.attack(hero, target)
+    return time.perf_counter() - start
+
+def uncached(self):
+    return derived_stats.compute_stats(self)
+
+def main():
+    attacks = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cached_seconds = run(attacks)
+
+    cached_method = Character.derived_stats
+    Character.derived_stats = uncached
+    try:
+        uncached_seconds = run(attacks)
+    finally:
+        Character.derived_stats = cached_method
+
+    print(f"{attacks} attacks")
+    print(f"  recomputed: {attacks / uncached_seconds:12,.0f} attacks/s")
+    print(f"  cached:     {attacks / cached_seconds:12,.0f} attacks/s")
+    print(f"  speedup:    {uncached_seconds / cached_seconds:.2f}x")
+
+if __name__ == "__main__":
+    main()
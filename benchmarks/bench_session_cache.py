@@ -0,0 +1,60 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: character loads through the session cache
+
+Loads a small set of hot characters over and over from a SQLite save
+database, once with the session cache and once reading every load from
+the database.
+Run from the project root:  python benchmarks/bench_session_cache.py [loads]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from save_backends import SQLiteSaveBackend
+from session_cache import SessionCache
+
+HOT_CHARACTERS = 50
+
+def run(loads):
+    """Return seconds taken for loads character_manager.load_character() calls."""
+    start = time.perf_counter()
+    for i in range(loads):
+        character_manager.load_character(f"Hero{i % HOT_CHARACTERS:03d}")
+    return time.perf_counter() - start
+
+def main():
+    loads = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteSaveBackend(os.path.join(directory, "characters.db"))
+        character_manager.set_save_backend(backend)
+        try:
+            for i in range(HOT_CHARACTERS):
+                character = character_manager.create_character(f"Hero{i:03d}", "Warrior")
+                character["completed_quests"].extend(f"quest_{n}" for n in range(40))
+                character_manager.save_character(character)
+
+            character_manager.set_session_cache(None)
+            uncached_seconds = run(loads)
+            cache = SessionCache()
+            character_manager.set_session_cache(cache)
+            cached_seconds = run(loads)
+        finally:
+            character_manager.set_session_cache(SessionCache(
+                character_manager.SESSION_CACHE_ENTRIES, character_manager.SESSION_CACHE_BUDGET))
+            character_manager.set_save_backend(None)
+            backend.close()
+
+    print(f"{loads} loads of {HOT_CHARACTERS} characters")
+    print(f"  database:   {loads / uncached_seconds:12,.0f} loads/s")
+    print(f"  cached:     {loads / cached_seconds:12,.0f} loads/s")
+    print(f"  speedup:    {uncached_seconds / cached_seconds:.2f}x")
+    print(f"  cache:      {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
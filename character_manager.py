@@ -6,11 +6,33 @@ Name: Darenell Curry
 AI Usage: AI suggested standard save/load routines and basic leveling logic.
 """
 
-import json
 import os
 from custom_exceptions import *
+from quest_log import QuestSet
+from inventory_stacks import Inventory
+from character_model import Character
+from leveling import LevelCurve
+from save_backends import SQLiteSaveBackend
+from save_queue import SaveQueue
+from session_cache import SessionCache
 
 SAVE_DIR = "saves"
+# Database inside SAVE_DIR used by the default save backend
+SAVE_DATABASE = "characters.db"
+# Queue default-backend saves and write them from a background thread
+WRITE_BEHIND = True
+XP_PER_LEVEL = 100
+
+# Loaded characters kept in memory by load_character(), and roughly how
+# many bytes they may take; see set_session_cache()
+SESSION_CACHE_ENTRIES = 1024
+SESSION_CACHE_BUDGET = 64 * 2**20
+
+# Gold a new character starts with, enough for a few potions
+STARTING_GOLD = 100
+
+# Leveling curve used by gain_experience(); replace with set_level_curve()
+LEVEL_CURVE = LevelCurve([XP_PER_LEVEL])
 
 # ----------------------------------------------------------------------------
 # CHARACTER CREATION
@@ -25,59 +47,173 @@ def create_character(name, char_class):
         raise InvalidCharacterClassError(f"{char_class} is not a valid class")
     
     # Default character stats
-    return {
-        "name": name,
-        "class": char_class,
-        "level": 1,
-        "experience": 0,
-        "gold": 0,
-        "health": 100,
-        "max_health": 100,
-        "attack": 5,
-        "defense": 2,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+    return Character(name, char_class, gold=STARTING_GOLD)
 
 # ----------------------------------------------------------------------------
 # SAVE AND LOAD FUNCTIONS
 # ----------------------------------------------------------------------------
 def save_character(character):
     """
-    Save character data as JSON.
+    Save character data through the current save backend.
+    A Character that was loaded or saved before only appends the fields
+    that changed to its save journal; anything else is saved in full.
+    Saved Characters are kept in the session cache; saving anything else
+    drops the cached character of that name, which is now out of date.
     Returns True on success.
     Raises SaveFileCorruptedError on failure.
     """
-    try:
-        os.makedirs(SAVE_DIR, exist_ok=True)
-        path = os.path.join(SAVE_DIR, f"{character['name']}.json")
-        with open(path, "w") as f:
-            json.dump(character, f, indent=4)
+    cache = get_session_cache()
+    if not isinstance(character, Character):
+        if cache is not None:
+            cache.discard(character["name"])
+        _write(character)
         return True
+
+    # _write() moves the saved name along, so read the old one first
+    saved_name = character.saved_name
+    _write(character)
+    if cache is not None:
+        if saved_name is not None and saved_name != character["name"]:
+            # Renamed: the old name's save on disk is unchanged
+            cache.discard(saved_name)
+        cache.put(character["name"], character)
+    return True
+
+def _write(character):
+    backend = get_save_backend()
+    tracked = isinstance(character, Character)
+    try:
+        delta = character.take_delta(backend) if tracked else None
+        if delta is None:
+            backend.save(character["name"], _save_data(character))
+        elif delta:
+            try:
+                backend.append_delta(character["name"], delta)
+            except CharacterNotFoundError:
+                # Renamed, deleted or saved somewhere else since: start over
+                backend.save(character["name"], _save_data(character))
     except Exception:
+        if tracked:
+            character.mark_unsaved()
         raise SaveFileCorruptedError("Failed to save character")
 
 def load_character(name):
     """
-    Load character JSON data by name.
+    Load a saved character by name.
+    A character still in the session cache is returned as is (the same
+    object every time, including changes not saved yet) without reading
+    the save backend.
     Raises CharacterNotFoundError if no save exists.
-    Raises SaveFileCorruptedError if file cannot be read.
+    Raises SaveFileCorruptedError if the save cannot be read.
     """
-    path = os.path.join(SAVE_DIR, f"{name}.json")
-    if not os.path.exists(path):
-        raise CharacterNotFoundError(f"Character '{name}' not found")
+    # Resolved first: switching SAVE_DIR empties the cache
+    backend = get_save_backend()
+    cache = get_session_cache()
+    if cache is not None:
+        character = cache.get(name)
+        if character is not None and character["name"] == name:
+            return character
+        if character is not None:
+            cache.discard(name)
+    data = backend.load(name)
     try:
-        with open(path) as f:
-            return json.load(f)
-    except Exception:
-        raise SaveFileCorruptedError(f"Corrupted save file for {name}")
+        character = Character.from_dict(data)
+    except (KeyError, TypeError, ValueError, AttributeError) as error:
+        raise SaveFileCorruptedError(f"Malformed save file for {name}: {error!r}")
+    character.mark_saved(backend)
+    if cache is not None:
+        cache.put(name, character)
+    return character
 
-def list_saved_characters():
-    """Return a list of saved character names."""
-    if not os.path.exists(SAVE_DIR):
-        return []
-    return [f.replace(".json", "") for f in os.listdir(SAVE_DIR)]
+def delete_character(name):
+    """
+    Delete a saved character.
+    Raises CharacterNotFoundError if no save exists.
+    """
+    if _session_cache is not None:
+        _session_cache.discard(name)
+    get_save_backend().delete(name)
+    return True
+
+def _save_data(character):
+    """
+    Return a character (dict, Character or store row) as a plain save-file
+    dictionary, with QuestSets and Inventories as plain lists.
+    """
+    return {key: value.to_list() if isinstance(value, (QuestSet, Inventory)) else value
+            for key, value in character.items()}
+
+def list_saved_characters(after=None, limit=None):
+    """
+    Return saved character names in sorted order.
+    Pass limit (and the last name of the previous page as after) to page.
+    """
+    return get_save_backend().list_names(after, limit)
+
+# ----------------------------------------------------------------------------
+# SAVE BACKEND
+# ----------------------------------------------------------------------------
+_save_backend = None
+_default_backend = None
+_default_path = None
+
+def get_save_backend():
+    """
+    Return the backend saves go through: the one given to
+    set_save_backend(), or else a SQLite database in SAVE_DIR, behind a
+    write-behind SaveQueue when WRITE_BEHIND is set.
+    """
+    global _default_backend, _default_path
+    if _save_backend is not None:
+        return _save_backend
+    path = os.path.join(SAVE_DIR, SAVE_DATABASE)
+    if _default_backend is None or _default_path != path:
+        if _default_backend is not None:
+            _default_backend.close()
+        if _session_cache is not None:
+            _session_cache.clear()
+        _default_backend = SQLiteSaveBackend(path)
+        if WRITE_BEHIND:
+            _default_backend = SaveQueue(_default_backend)
+        _default_path = path
+    return _default_backend
+
+def flush_saves():
+    """Write any queued saves now. Call before the game exits."""
+    flush = getattr(get_save_backend(), "flush", None)
+    if flush is not None:
+        flush()
+
+def set_save_backend(backend):
+    """
+    Send saves to backend (e.g. save_backends.JSONSaveBackend(SAVE_DIR) for
+    the old one-file-per-character layout). None restores the default.
+    """
+    global _save_backend
+    _save_backend = backend
+    if _session_cache is not None:
+        _session_cache.clear()
+
+# ----------------------------------------------------------------------------
+# SESSION CACHE
+# ----------------------------------------------------------------------------
+_session_cache = SessionCache(SESSION_CACHE_ENTRIES, SESSION_CACHE_BUDGET, on_evict=_write)
+
+def get_session_cache():
+    """Return the SessionCache load_character() reads through, or None."""
+    return _session_cache
+
+def set_session_cache(cache):
+    """
+    Replace the session cache, e.g. with SessionCache(max_entries=100,
+    memory_budget=2**20) for a smaller one. Characters it evicts with
+    unsaved changes are saved first. None turns caching off, so every
+    load reads the save backend.
+    """
+    global _session_cache
+    if cache is not None and cache.on_evict is None:
+        cache.on_evict = _write
+    _session_cache = cache
 
 # ----------------------------------------------------------------------------
 # CHARACTER ACTIONS
@@ -90,17 +226,32 @@ def heal_character(character, value):
 def gain_experience(character, xp):
     """
     Add XP and level up character automatically if threshold reached.
-    Raises CharacterDeadError if character is dead.
+    Level-ups are looked up on LEVEL_CURVE, so any amount of XP costs one
+    binary search, and the stat gains are applied once.
+    Returns the number of levels gained.
+    Raises:
+        CharacterDeadError if character is dead.
+        ValueError if xp is negative.
     """
     if character["health"] <= 0:
         raise CharacterDeadError()
-    character["experience"] += xp
-    while character["experience"] >= 100:
-        character["experience"] -= 100
-        character["level"] += 1
+    if xp < 0:
+        raise ValueError("Experience cannot be negative")
+    return LEVEL_CURVE.apply_experience(character, xp)
+
+def set_level_curve(curve):
+    """Replace the leveling curve used by gain_experience()."""
+    global LEVEL_CURVE
+    LEVEL_CURVE = curve
 
 def add_gold(character, amount):
-    """Add gold to character. Dead characters cannot receive gold."""
+    """
+    Add gold to character (negative amounts spend it).
+    Dead characters cannot receive gold.
+    Raises ValueError if the character cannot cover a negative amount.
+    """
     if character["health"] <= 0:
         raise CharacterDeadError()
+    if character["gold"] + amount < 0:
+        raise ValueError(f"{character['name']} has only {character['gold']} gold")
     character["gold"] += amount
@@ -0,0 +1,250 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Model Module
+
+Name: Darenell Curry
+AI Usage: AI suggested using __slots__ with a MutableMapping interface so
+character["..."] code keeps working.
+"""
+
+from collections.abc import MutableMapping
+from derived_stats import DERIVED_FROM, compute_stats
+from inventory_stacks import Inventory
+from quest_log import QuestSet
+
+# Save-file key -> attribute name. "class" is a keyword, so it is stored
+# as char_class but still read and written as character["class"].
+FIELD_SLOTS = {
+    "name": "name",
+    "class": "char_class",
+    "level": "level",
+    "experience": "experience",
+    "gold": "gold",
+    "health": "health",
+    "max_health": "max_health",
+    "attack": "attack",
+    "defense": "defense",
+    "strength": "strength",
+    "magic": "magic",
+    "inventory": "inventory",
+    "active_quests": "active_quests",
+    "completed_quests": "completed_quests",
+}
+
+# Fields held in QuestSet / Inventory objects, saved as plain lists
+_CONTAINER_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+NUMERIC_FIELDS = ("level", "experience", "gold", "health", "max_health", "attack", "defense",
+                  "strength", "magic")
+
+# ----------------------------------------------------------------------------
+# CHARACTER
+# ----------------------------------------------------------------------------
+class Character(MutableMapping):
+    """
+    Compact character record.
+
+    Fixed fields live in __slots__ instead of a per-character dict, which
+    keeps large numbers of live characters small. The class is also a
+    mapping over the same keys as the old character dictionary, so code
+    like character["health"] -= 5 works unchanged. Keys outside the fixed
+    fields (equipped_weapon, ...) are kept in a small side dict that is
+    only created when first needed.
+    """
+
+    __slots__ = tuple(FIELD_SLOTS.values()) + (
+        "_extra", "_derived", "_dirty", "_saved_to", "_saved_name")
+
+    name: str
+    char_class: str
+    level: int
+    experience: int
+    gold: int
+    health: int
+    max_health: int
+    attack: int
+    defense: int
+    strength: int
+    magic: int
+
+    def __init__(self, name, char_class, level=1, experience=0, gold=0, health=100,
+                 max_health=100, attack=5, defense=2, strength=0, magic=0, inventory=None,
+                 active_quests=(), completed_quests=()):
+        self.name = name
+        self.char_class = char_class
+        self.level = level
+        self.experience = experience
+        self.gold = gold
+        self.health = health
+        self.max_health = max_health
+        self.attack = attack
+        self.defense = defense
+        self.strength = strength
+        self.magic = magic
+        self.inventory = Inventory(inventory or ())
+        self.active_quests = QuestSet(active_quests)
+        self.completed_quests = QuestSet(completed_quests)
+        self._extra = None
+        self._derived = None
+        self._dirty = None
+        self._saved_to = None
+        self._saved_name = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Character from a save-file dictionary.
+        Missing numeric fields use the defaults; unknown keys are kept.
+        """
+        character = cls(data["name"], data["class"])
+        for key, value in data.items():
+            if key in NUMERIC_FIELDS:
+                value = int(value)
+            character[key] = value
+        return character
+
+    def to_dict(self):
+        """Return a plain dictionary in the save-file layout."""
+        data = {key: getattr(self, slot) for key, slot in FIELD_SLOTS.items()}
+        data["inventory"] = self.inventory.to_list()
+        data["active_quests"] = self.active_quests.to_list()
+        data["completed_quests"] = self.completed_quests.to_list()
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    # ------------------------------------------------------------------------
+    # CHANGE TRACKING
+    # ------------------------------------------------------------------------
+    def mark_saved(self, saved_to=None):
+        """
+        Treat the current state as saved (in the save backend saved_to)
+        and track changes from here.
+        """
+        self._dirty = set()
+        self._saved_to = saved_to
+        self._saved_name = self.name
+        self.inventory.track()
+        self.active_quests.track()
+        self.completed_quests.track()
+
+    @property
+    def saved_name(self):
+        """Name the character was last saved or loaded under (None if never)."""
+        return self._saved_name
+
+    def mark_unsaved(self):
+        """Stop tracking, so the next save writes the whole character."""
+        self._dirty = None
+
+    def has_changes(self):
+        """Return True if anything changed since the last save (or there was none)."""
+        return (self._dirty is None or bool(self._dirty) or self.name != self._saved_name
+                or self.inventory.has_changes()
+                or self.active_quests.has_changes() or self.completed_quests.has_changes())
+
+    def take_delta(self, saved_to=None):
+        """
+        Return the changes since the last save to saved_to as a
+        save_journal delta, and track again from here. Returns None if the
+        character needs a full save there (it was never saved or loaded
+        from it, was renamed since, or mark_unsaved() was called); an
+        empty dict means nothing changed.
+        """
+        dirty = self._dirty
+        if dirty is None or self._saved_to is not saved_to or self.name != self._saved_name:
+            self.mark_saved(saved_to)
+            return None
+
+        assigned, unset = {}, []
+        for key in dirty:
+            if key in self:
+                value = self[key]
+                assigned[key] = value.to_list() if key in _CONTAINER_FIELDS else value
+            else:
+                unset.append(key)
+
+        quests, items = {}, {}
+        for key in ("active_quests", "completed_quests"):
+            changes = self[key].take_changes()
+            if key in dirty:
+                continue
+            if changes is None:
+                assigned[key] = self[key].to_list()
+            elif changes:
+                quests[key] = changes
+        changes = self.inventory.take_changes()
+        if "inventory" not in dirty:
+            if changes is None:
+                assigned["inventory"] = self.inventory.to_list()
+            elif changes:
+                items["inventory"] = changes
+
+        self._dirty = set()
+        delta = {}
+        for section, value in (("set", assigned), ("unset", unset),
+                               ("quests", quests), ("items", items)):
+            if value:
+                delta[section] = value
+        return delta
+
+    def derived_stats(self):
+        """
+        Return the cached DerivedStats, working them out again only after
+        attack, defense, strength, level, equipment or buffs were assigned
+        through character[...].
+        """
+        derived = self._derived
+        if derived is None:
+            derived = self._derived = compute_stats(self)
+        return derived
+
+    def __getitem__(self, key):
+        slot = FIELD_SLOTS.get(key)
+        if slot is not None:
+            return getattr(self, slot)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in DERIVED_FROM:
+            self._derived = None
+        if self._dirty is not None:
+            self._dirty.add(key)
+        slot = FIELD_SLOTS.get(key)
+        if slot is not None:
+            if key in ("active_quests", "completed_quests") and not isinstance(value, QuestSet):
+                value = QuestSet(value)
+            elif key == "inventory" and not isinstance(value, Inventory):
+                value = Inventory(value)
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in FIELD_SLOTS:
+            raise TypeError(f"Cannot delete required character field '{key}'")
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        if key in DERIVED_FROM:
+            self._derived = None
+        if self._dirty is not None:
+            self._dirty.add(key)
+        del self._extra[key]
+
+    def __contains__(self, key):
+        return key in FIELD_SLOTS or (self._extra is not None and key in self._extra)
+
+    def __iter__(self):
+        yield from FIELD_SLOTS
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return len(FIELD_SLOTS) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self):
+        return f"Character({self.name!r}, {self.char_class!r}, level={self.level})"
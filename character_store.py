@@ -0,0 +1,184 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Store Module
+
+Name: Darenell Curry
+AI Usage: AI suggested the column layout and map()-based bulk updates.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from itertools import repeat
+from operator import add, mul
+
+import character_manager
+from custom_exceptions import *
+from inventory_stacks import Inventory
+from quest_log import QuestSet
+
+# Numeric fields kept as contiguous int64 columns, one entry per character
+COLUMNS = ("health", "max_health", "attack", "defense", "level", "experience", "gold")
+
+# Everything else is kept in plain per-row lists
+ROW_FIELDS = ("name", "class", "inventory", "active_quests", "completed_quests")
+
+# ----------------------------------------------------------------------------
+# CHARACTER STORE
+# ----------------------------------------------------------------------------
+class CharacterStore:
+    """
+    Struct-of-arrays storage for many characters at once.
+
+    Each numeric stat is one array("q") column, so server-wide effects
+    (regen ticks, XP events, gold events) run over whole columns instead
+    of one character dictionary at a time. row(index) returns a view that
+    behaves like a character dictionary for combat_system, quest_handler
+    and character_manager.
+    """
+
+    def __init__(self, characters=()):
+        self.columns = {column: array("q") for column in COLUMNS}
+        self.fields = {field: [] for field in ROW_FIELDS}
+        self.extras = []
+        for character in characters:
+            self.add(character)
+
+    def __len__(self):
+        return len(self.extras)
+
+    def __iter__(self):
+        return (CharacterRow(self, index) for index in range(len(self)))
+
+    def add(self, character):
+        """
+        Copy a character (dict or Character) into the store. Returns its row index.
+        Quest and inventory containers are copied too, so changing a row
+        never changes the character it came from.
+        """
+        for column in COLUMNS:
+            self.columns[column].append(int(character[column]))
+        for field in ROW_FIELDS:
+            value = character[field]
+            if field in ("active_quests", "completed_quests"):
+                value = QuestSet(value)
+            elif field == "inventory":
+                value = Inventory(list(value))
+            self.fields[field].append(value)
+        self.extras.append({key: character[key] for key in character
+                            if key not in self.columns and key not in self.fields})
+        return len(self) - 1
+
+    def row(self, index):
+        """Return a dictionary-style view of one stored character."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"No character at row {index}")
+        return CharacterRow(self, index)
+
+    # ------------------------------------------------------------------------
+    # BULK OPERATIONS
+    # ------------------------------------------------------------------------
+    def heal_all(self, amount):
+        """
+        Heal every living character by amount, capped at max_health.
+        Dead characters (health 0) are not revived.
+        """
+        health = self.columns["health"]
+        # bool(health) is 1 for the living and 0 for the dead, so the dead
+        # get a heal of 0. map() over builtins keeps the loop in C.
+        heals = map(mul, map(bool, health), repeat(amount))
+        health[:] = array("q", map(min, self.columns["max_health"], map(add, health, heals)))
+
+    def add_gold_all(self, amount):
+        """
+        Give every living character amount gold.
+        Raises ValueError if amount is negative.
+        """
+        if amount < 0:
+            raise ValueError("Bulk gold grants cannot be negative")
+        gold = self.columns["gold"]
+        grants = map(mul, map(bool, self.columns["health"]), repeat(amount))
+        gold[:] = array("q", map(add, gold, grants))
+
+    def grant_xp_all(self, xp):
+        """
+        Give every living character xp, applying level-ups with the same
+        curve and stat gains as character_manager.gain_experience().
+        Returns the total number of levels gained across the store.
+        Raises ValueError if xp is negative.
+        """
+        if xp < 0:
+            raise ValueError("Experience cannot be negative")
+        curve = character_manager.LEVEL_CURVE
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+        attack = self.columns["attack"]
+        defense = self.columns["defense"]
+        level = self.columns["level"]
+        experience = self.columns["experience"]
+
+        total_levels = 0
+        for index in range(len(self)):
+            if health[index] <= 0:
+                continue
+            # Most grants do not cross a level boundary; skip the lookup
+            if experience[index] + xp < curve.xp_to_next_level(level[index]):
+                experience[index] += xp
+                continue
+            new_level, experience[index] = curve.level_for(
+                curve.total_xp(level[index], experience[index]) + xp)
+            gained = new_level - level[index]
+            level[index] = new_level
+            max_health[index] += gained * curve.health_per_level
+            attack[index] += gained * curve.attack_per_level
+            defense[index] += gained * curve.defense_per_level
+            health[index] = max_health[index]
+            total_levels += gained
+        return total_levels
+
+# ----------------------------------------------------------------------------
+# ROW VIEW
+# ----------------------------------------------------------------------------
+class CharacterRow(MutableMapping):
+    """
+    Character-dictionary view of one row in a CharacterStore.
+    Reads and writes go straight to the store's columns.
+    """
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store = self.store
+        if key in store.columns:
+            return store.columns[key][self.index]
+        if key in store.fields:
+            return store.fields[key][self.index]
+        return store.extras[self.index][key]
+
+    def __setitem__(self, key, value):
+        store = self.store
+        if key in store.columns:
+            store.columns[key][self.index] = int(value)
+        elif key in store.fields:
+            store.fields[key][self.index] = value
+        else:
+            store.extras[self.index][key] = value
+
+    def __delitem__(self, key):
+        if key in self.store.columns or key in self.store.fields:
+            raise TypeError(f"Cannot delete required character field '{key}'")
+        del self.store.extras[self.index][key]
+
+    def __iter__(self):
+        yield from self.store.fields
+        yield from self.store.columns
+        yield from list(self.store.extras[self.index])
+
+    def __len__(self):
+        return len(COLUMNS) + len(ROW_FIELDS) + len(self.store.extras[self.index])
+
+    def __repr__(self):
+        return f"CharacterRow({self['name']!r}, row={self.index})"
@@ -0,0 +1,102 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat Clock Module
+
+Name: Darenell Curry
+AI Usage: AI suggested a timing wheel with an overflow heap for expirations.
+"""
+
+import heapq
+
+# Expirations less than this many ticks away go straight into a wheel slot;
+# anything further out waits in a heap until it comes within range.
+WHEEL_SLOTS = 16
+
+# ----------------------------------------------------------------------------
+# COMBAT CLOCK
+# ----------------------------------------------------------------------------
+class CombatClock:
+    """
+    Per-battle tick counter that tracks cooldowns and timed status effects.
+
+    Cooldowns are stored as the tick they end on, so checking one is a
+    dict lookup. Status effects are summed per (combatant, stat) when they
+    start, and each one books its expiry in a timing wheel slot. Advancing
+    a tick only touches the effects that expire on that tick, never the
+    full list of active effects.
+
+    Combatants are identified by any hashable key (SimpleBattle uses
+    "player" and "enemy"). Stats are "attack" and "defense" modifiers or
+    "dot", damage taken at the end of every round.
+    """
+
+    __slots__ = ("tick", "slots", "overflow", "cooldowns", "modifiers", "_sequence")
+
+    def __init__(self):
+        self.tick = 0
+        self.slots = [None] * WHEEL_SLOTS
+        self.overflow = []
+        self.cooldowns = {}
+        self.modifiers = {}
+        self._sequence = 0
+
+    # ------------------------------------------------------------------------
+    # COOLDOWNS
+    # ------------------------------------------------------------------------
+    def start_cooldown(self, owner, ability_id, ticks):
+        """Make ability_id unavailable to owner for the next ticks ticks."""
+        if ticks > 0:
+            self.cooldowns[(owner, ability_id)] = self.tick + ticks
+
+    def cooldown_remaining(self, owner, ability_id):
+        """Return how many ticks until owner can use ability_id again (0 = ready)."""
+        return max(0, self.cooldowns.get((owner, ability_id), 0) - self.tick)
+
+    # ------------------------------------------------------------------------
+    # STATUS EFFECTS
+    # ------------------------------------------------------------------------
+    def add_effect(self, target, stat, amount, duration):
+        """Add amount to target's stat modifier for duration ticks."""
+        if duration <= 0 or amount == 0:
+            return
+        key = (target, stat)
+        self.modifiers[key] = self.modifiers.get(key, 0) + amount
+        self._schedule(self.tick + duration, key, amount)
+
+    def modifier(self, target, stat):
+        """Return the total active modifier for target's stat."""
+        return self.modifiers.get((target, stat), 0)
+
+    def advance(self):
+        """
+        Move to the next tick and remove the effects that end on it.
+        Returns the list of (target, stat, amount) effects that expired.
+        """
+        self.tick += 1
+        index = self.tick % WHEEL_SLOTS
+        expired = self.slots[index] or []
+        self.slots[index] = None
+
+        # Pull far-off expirations into the wheel once they are in range
+        overflow = self.overflow
+        while overflow and overflow[0][0] < self.tick + WHEEL_SLOTS:
+            due, _, key, amount = heapq.heappop(overflow)
+            self._schedule(due, key, amount)
+
+        for key, amount in expired:
+            remaining = self.modifiers[key] - amount
+            if remaining:
+                self.modifiers[key] = remaining
+            else:
+                del self.modifiers[key]
+        return [(target, stat, amount) for (target, stat), amount in expired]
+
+    def _schedule(self, due, key, amount):
+        if due - self.tick < WHEEL_SLOTS:
+            index = due % WHEEL_SLOTS
+            if self.slots[index] is None:
+                self.slots[index] = []
+            self.slots[index].append((key, amount))
+        else:
+            self._sequence += 1
+            heapq.heappush(self.overflow, (due, self._sequence, key, amount))
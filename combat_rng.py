@@ -0,0 +1,87 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat RNG Module
+
+Name: Darenell Curry
+AI Usage: AI suggested drawing random numbers in blocks from a seeded generator.
+"""
+
+import random
+import sys
+from array import array
+
+# Random numbers generated per refill of the buffer
+BLOCK_SIZE = 256
+
+_UINT32_RANGE = 1 << 32
+
+# ----------------------------------------------------------------------------
+# COMBAT RNG
+# ----------------------------------------------------------------------------
+class CombatRNG:
+    """
+    Seeded random number stream for one battle.
+
+    Numbers are generated BLOCK_SIZE at a time with one randbytes() call
+    and handed out from the buffer, instead of one random.random() call
+    per roll. The stream depends only on the seed, so replaying a battle
+    with the same seed and the same player actions gives bit-identical
+    results.
+    """
+
+    __slots__ = ("seed", "draws", "_source", "_block", "_position")
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.draws = 0
+        self._source = random.Random(seed)
+        self._block = array("I")
+        self._position = 0
+
+    def next_uint32(self):
+        """Return the next raw 32-bit number from the stream."""
+        if self._position >= len(self._block):
+            self._refill()
+        value = self._block[self._position]
+        self._position += 1
+        self.draws += 1
+        return value
+
+    def random(self):
+        """Return a float in [0.0, 1.0)."""
+        return self.next_uint32() / _UINT32_RANGE
+
+    def chance(self, probability):
+        """Return True with the given probability."""
+        return self.next_uint32() < probability * _UINT32_RANGE
+
+    def randint(self, low, high):
+        """Return an integer in [low, high], without modulo bias."""
+        span = high - low + 1
+        if span <= 0:
+            raise ValueError("randint() needs low <= high")
+        limit = _UINT32_RANGE - _UINT32_RANGE % span
+        value = self.next_uint32()
+        while value >= limit:
+            value = self.next_uint32()
+        return low + value % span
+
+    def choice(self, options):
+        """Return a random element of a non-empty sequence."""
+        if not options:
+            raise IndexError("Cannot choose from an empty sequence")
+        return options[self.randint(0, len(options) - 1)]
+
+    def _refill(self):
+        block = array("I")
+        if block.itemsize != 4:
+            raise RuntimeError("CombatRNG needs a 4-byte unsigned int array type")
+        # randbytes() is little-endian; swap on big-endian machines so the
+        # stream is the same everywhere
+        block.frombytes(self._source.randbytes(4 * BLOCK_SIZE))
+        if sys.byteorder == "big":
+            block.byteswap()
+        self._block = block
+        self._position = 0
@@ -6,7 +6,231 @@ Name: Darenell Curry
 AI Usage: AI suggested turn-based combat logic and error handling for invalid targets.
 """
 
+import os
+import sys
+from array import array
+from collections import namedtuple
+from operator import add
+
 from custom_exceptions import *
+from character_store import CharacterStore
+from derived_stats import compute_stats, effective_stats
+from combat_clock import CombatClock
+from combat_rng import CombatRNG
+from templates import Instance, freeze
+import game_data
+
+# Winner codes returned by battle_many()
+STALEMATE = 0
+ATTACKER_WINS = 1
+DEFENDER_WINS = 2
+
+ABILITY_FILE = os.path.join(game_data.DATA_DIR, "abilities.txt")
+
+# Basic attacks in a SimpleBattle can critically hit
+CRIT_CHANCE = 0.1
+CRIT_MULTIPLIER = 2
+
+ENEMY_FILE = os.path.join(game_data.DATA_DIR, "enemies.txt")
+
+# Enemy stat blocks and spawn tables are precomputed for levels 1..MAX_LEVEL;
+# higher levels use the MAX_LEVEL tables
+MAX_LEVEL = 100
+
+# ----------------------------------------------------------------------------
+# ABILITY REGISTRY
+# ----------------------------------------------------------------------------
+
+# effect is None or a (kind, amount, duration) tuple, see data/abilities.txt
+Ability = namedtuple("Ability", "id key name damage heal cost cooldown effect")
+
+class AbilityRegistry:
+    """
+    Abilities loaded once from data/abilities.txt.
+    Each ability gets a small integer id; table[id] is its Ability record,
+    so combat turns dispatch with a list index. Names are interned and can
+    be looked up by ability_id ("power_strike") or display name
+    ("Power Strike").
+    """
+
+    def __init__(self, abilities):
+        self.table = []
+        self.ids = {}
+        for key, data in abilities.items():
+            ability = Ability(len(self.table), sys.intern(key), sys.intern(data["name"]),
+                              data["damage"], data["heal"], data["cost"], data["cooldown"],
+                              _parse_effect(data["effect"]))
+            self.table.append(ability)
+            self.ids[ability.key] = ability.id
+            self.ids[ability.name] = ability.id
+
+    def __len__(self):
+        return len(self.table)
+
+    def get(self, ability):
+        """
+        Return the Ability for an integer id, ability_id or display name.
+        Raises InvalidTargetError if it does not exist.
+        """
+        if isinstance(ability, int):
+            if 0 <= ability < len(self.table):
+                return self.table[ability]
+        elif ability in self.ids:
+            return self.table[self.ids[ability]]
+        raise InvalidTargetError(f"{ability} is not a valid ability")
+
+def _parse_effect(effect):
+    """Turn "kind:amount:duration" into a tuple once, at load time."""
+    if effect == "NONE":
+        return None
+    kind, amount, duration = effect.split(":")
+    return sys.intern(kind), int(amount), int(duration)
+
+_ability_registry = None
+
+def get_ability_registry():
+    """Return the shared AbilityRegistry, loading it on first use."""
+    global _ability_registry
+    if _ability_registry is None:
+        _ability_registry = AbilityRegistry(game_data.load_abilities(ABILITY_FILE))
+    return _ability_registry
+
+# ----------------------------------------------------------------------------
+# ENEMIES
+# ----------------------------------------------------------------------------
+
+class EnemyRegistry:
+    """
+    Enemy templates loaded once from data/enemies.txt.
+
+    For every enemy and level the scaled stat block is built up front, and
+    for every character level there is an alias table over the enemies
+    that appear at that level, weighted by WEIGHT. Stat blocks are frozen
+    and shared; a spawned enemy is an Instance that only stores the fields
+    changed during play, so spawning is two random draws and no copying.
+    """
+
+    def __init__(self, enemies):
+        self.enemy_ids = list(enemies)
+        # enemy_id -> list of stat blocks; index 0 is the enemy's MIN_LEVEL
+        self.templates = {}
+        for enemy_id, data in enemies.items():
+            self.templates[enemy_id] = [freeze(_scaled_enemy(data, level))
+                                        for level in range(data["min_level"],
+                                                           min(data["max_level"], MAX_LEVEL) + 1)]
+        self.min_levels = {enemy_id: data["min_level"] for enemy_id, data in enemies.items()}
+
+        # spawn_tables[level] = (enemy ids, alias probabilities, alias indexes)
+        self.spawn_tables = [None]
+        for level in range(1, MAX_LEVEL + 1):
+            options = [enemy_id for enemy_id, data in enemies.items()
+                       if data["min_level"] <= level <= data["max_level"]]
+            if not options:
+                # Nothing listed for this level: fall back to every enemy
+                options = list(enemies)
+            weights = [enemies[enemy_id]["weight"] for enemy_id in options]
+            self.spawn_tables.append((options,) + _build_alias_table(weights))
+
+    def create(self, enemy_type, level=None):
+        """
+        Return a fresh enemy at level (default: the enemy's lowest level).
+        Levels outside the enemy's range use its nearest stat block.
+        Raises InvalidTargetError if the enemy type does not exist.
+        """
+        blocks = self.templates.get(enemy_type.lower())
+        if blocks is None:
+            raise InvalidTargetError(f"{enemy_type} is not a known enemy type")
+        index = 0 if level is None else level - self.min_levels[enemy_type.lower()]
+        return Instance(blocks[max(0, min(index, len(blocks) - 1))])
+
+    def pick(self, level, rng):
+        """Pick a weighted random enemy id for a character level in O(1)."""
+        options, probabilities, aliases = self.spawn_tables[max(1, min(level, MAX_LEVEL))]
+        index = rng.randint(0, len(options) - 1)
+        if rng.random() >= probabilities[index]:
+            index = aliases[index]
+        return options[index]
+
+def _scaled_enemy(data, level):
+    """Return the stat block for one enemy at one level."""
+    steps = level - data["min_level"]
+    health = data["health"] + steps * data["health_per_level"]
+    return {
+        "enemy_id": data["enemy_id"],
+        "name": data["name"],
+        "level": level,
+        "health": health,
+        "max_health": health,
+        "attack": data["attack"] + steps * data["attack_per_level"],
+        "defense": data["defense"] + steps * data["defense_per_level"],
+        "xp_reward": data["xp_reward"],
+        "gold_reward": data["gold_reward"],
+    }
+
+def _build_alias_table(weights):
+    """
+    Walker/Vose alias method: returns (probabilities, aliases) so a
+    weighted pick is one uniform index plus one biased coin flip.
+    """
+    count = len(weights)
+    total = sum(weights)
+    scaled = [weight * count / total for weight in weights]
+    probabilities = [1.0] * count
+    aliases = list(range(count))
+    small = [index for index, value in enumerate(scaled) if value < 1.0]
+    large = [index for index, value in enumerate(scaled) if value >= 1.0]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        probabilities[low] = scaled[low]
+        aliases[low] = high
+        scaled[high] -= 1.0 - scaled[low]
+        (small if scaled[high] < 1.0 else large).append(high)
+    return probabilities, aliases
+
+_enemy_registry = None
+
+def get_enemy_registry():
+    """Return the shared EnemyRegistry, loading it on first use."""
+    global _enemy_registry
+    if _enemy_registry is None:
+        _enemy_registry = EnemyRegistry(game_data.load_enemies(ENEMY_FILE))
+    return _enemy_registry
+
+def create_enemy(enemy_type, level=None):
+    """
+    Create an enemy from data/enemies.txt, scaled to level if given.
+    Raises InvalidTargetError if the enemy type does not exist.
+    """
+    return get_enemy_registry().create(enemy_type, level)
+
+def get_random_enemy_for_level(level, rng=None):
+    """
+    Create a random enemy suited to a character level, weighted by the
+    enemies' WEIGHT values. Pass a CombatRNG to make the pick reproducible;
+    otherwise one shared unseeded CombatRNG is used.
+    """
+    if rng is None:
+        rng = _spawn_rng()
+    registry = get_enemy_registry()
+    return registry.create(registry.pick(level, rng), level)
+
+_shared_rng = None
+
+def _spawn_rng():
+    """Return the shared CombatRNG, created on first use (seeding one is slow)."""
+    global _shared_rng
+    if _shared_rng is None:
+        _shared_rng = CombatRNG()
+    return _shared_rng
+
+def get_victory_rewards(enemy):
+    """
+    Return the rewards for a defeated enemy: {"xp": ..., "gold": ...}.
+    Raises InvalidTargetError if the enemy is still alive.
+    """
+    if enemy["health"] > 0:
+        raise InvalidTargetError(f"{enemy['name']} has not been defeated")
+    return {"xp": enemy["xp_reward"], "gold": enemy["gold_reward"]}
 
 # ----------------------------------------------------------------------------
 # COMBAT FUNCTIONS
@@ -27,37 +251,31 @@ def attack(attacker, defender):
     if defender["health"] <= 0:
         raise CharacterDeadError(f"{defender['name']} is already dead")
 
-    damage = max(0, attacker["attack"] - defender["defense"])
+    damage = max(0, effective_stats(attacker).attack - effective_stats(defender).defense)
     defender["health"] = max(0, defender["health"] - damage)
     return damage
 
 def use_ability(attacker, defender, ability):
     """
     Use a special ability during combat.
+    ability may be an ability id number, ability_id or display name.
+    Ability costs are loaded but not charged until there is a mana system.
+    Returns damage dealt (negative when the ability heals).
     Raises:
         AbilityOnCooldownError: if ability is on cooldown.
         CharacterDeadError: if attacker or defender is dead.
+        InvalidTargetError: if the ability does not exist.
     """
     if attacker["health"] <= 0 or defender["health"] <= 0:
         raise CharacterDeadError("Cannot use ability with dead character")
-    
-    # AI suggested simple ability mechanics
-    abilities = {
-        "Fireball": 20,
-        "Heal": -15,  # negative damage = heal
-        "Power Strike": 25
-    }
 
-    if ability not in abilities:
-        raise InvalidTargetError(f"{ability} is not a valid ability")
+    ability = get_ability_registry().get(ability)
+    if ability.damage:
+        defender["health"] = max(0, defender["health"] - ability.damage)
+    if ability.heal:
+        attacker["health"] = min(attacker["max_health"], attacker["health"] + ability.heal)
 
-    damage = abilities[ability]
-    if damage > 0:
-        defender["health"] = max(0, defender["health"] - damage)
-    else:
-        attacker["health"] = min(attacker["max_health"], attacker["health"] - damage)
-    
-    return damage
+    return ability.damage - ability.heal
 
 def is_alive(character):
     """Check if a character is alive."""
@@ -65,12 +283,296 @@ def is_alive(character):
 
 def battle(attacker, defender):
     """
-    Simple turn-based battle simulation.
+    Turn-based battle: the attacker strikes first each round and the
+    defender answers while alive. Plain attacks always deal the same
+    damage, so the outcome comes from predict_battle() in O(1) instead of
+    playing out every round; both characters' health is updated to match.
     Returns winner character dictionary.
+    Raises CombatStalemateError if neither side can damage the other.
+    """
+    outcome = predict_battle(attacker, defender)
+    if outcome["stalemate"]:
+        raise CombatStalemateError(
+            f"{attacker['name']} and {defender['name']} cannot damage each other")
+    attacker["health"] = outcome["attacker_health"]
+    defender["health"] = outcome["defender_health"]
+    return outcome["winner"]
+
+def simulate_battle(attacker, defender):
+    """
+    Play a battle out one attack() at a time.
+    Gives the same result as battle(); use it when turns need to run for
+    their side effects.
+    Returns winner character dictionary.
+    Raises CombatStalemateError if neither side can damage the other.
     AI Usage: AI suggested alternating turns and simple victory condition.
     """
+    if predict_battle(attacker, defender)["stalemate"]:
+        raise CombatStalemateError(
+            f"{attacker['name']} and {defender['name']} cannot damage each other")
     while is_alive(attacker) and is_alive(defender):
         attack(attacker, defender)
         if is_alive(defender):
             attack(defender, attacker)
     return attacker if is_alive(attacker) else defender
+
+def predict_battle(attacker, defender):
+    """
+    Work out the result of battle() without changing either character.
+    Returns a dictionary:
+        "winner": the winning character, or None on a stalemate
+        "stalemate": True if neither side can damage the other
+        "rounds": rounds fought
+        "attacker_health", "defender_health": health left at the end
+    """
+    attacker_stats, defender_stats = effective_stats(attacker), effective_stats(defender)
+    winner, rounds, attacker_health, defender_health = _resolve_battle(
+        attacker["health"], attacker_stats.attack, attacker_stats.defense,
+        defender["health"], defender_stats.attack, defender_stats.defense)
+    if winner == ATTACKER_WINS:
+        winning_character = attacker
+    elif winner == DEFENDER_WINS:
+        winning_character = defender
+    else:
+        winning_character = None
+    return {
+        "winner": winning_character,
+        "stalemate": winner == STALEMATE,
+        "rounds": rounds,
+        "attacker_health": attacker_health,
+        "defender_health": defender_health,
+    }
+
+# ----------------------------------------------------------------------------
+# BATTLE CLASS
+# ----------------------------------------------------------------------------
+
+PLAYER = "player"
+ENEMY = "enemy"
+
+class SimpleBattle:
+    """
+    A battle between a character and an enemy, played one turn at a time.
+
+    Each battle owns a CombatClock. One tick passes per round (player
+    turn then enemy turn); that is when damage over time lands, status
+    effects run out and ability cooldowns count down.
+
+    Each battle also owns a seeded CombatRNG used for critical hits, and
+    records the player's actions. replay_battle() can re-run the battle
+    exactly from the starting stats, the seed and those actions.
+    """
+
+    def __init__(self, character, enemy, seed=None):
+        self.character = character
+        self.enemy = enemy
+        self.combat_active = True
+        self.clock = CombatClock()
+        self.rng = CombatRNG(seed)
+        self.seed = self.rng.seed
+        self.actions = []
+        self.rounds = 0
+        self.winner = None
+
+    def start_battle(self):
+        """
+        Fight until one side falls, with the player using basic attacks.
+        Returns {"winner": "player" or "enemy", "rounds": rounds fought}.
+        Raises CombatStalemateError if neither side can hurt the other,
+        checked again after every round as status effects run out.
+        """
+        self._check_stalemate()
+        while self.combat_active:
+            self.player_turn()
+            if self.combat_active:
+                self.enemy_turn()
+                if self.combat_active:
+                    self._check_stalemate()
+        return {"winner": self.winner, "rounds": self.rounds}
+
+    def _check_stalemate(self):
+        """
+        Raise CombatStalemateError if basic attacks cannot hurt either side
+        and no status effect (damage over time included) is still running.
+        """
+        if not self.clock.modifiers and predict_battle(self.character, self.enemy)["stalemate"]:
+            raise CombatStalemateError(
+                f"{self.character['name']} and {self.enemy['name']} cannot damage each other")
+
+    def player_turn(self, ability=None):
+        """
+        Player attacks, or uses ability (id number, ability_id or name).
+        Returns damage dealt.
+        Raises:
+            CombatNotActiveError: if the battle is over.
+            AbilityOnCooldownError: if the ability is still cooling down.
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("The battle is not active")
+        if ability is None:
+            damage = self._strike(PLAYER, ENEMY)
+        else:
+            damage = self._use_ability(PLAYER, ENEMY, ability)
+        self.actions.append(ability)
+        self.rounds += 1
+        self._check_end()
+        return damage
+
+    def enemy_turn(self):
+        """
+        Enemy attacks, then the round ends.
+        Returns damage dealt.
+        Raises CombatNotActiveError if the battle is over.
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("The battle is not active")
+        damage = self._strike(ENEMY, PLAYER)
+        self._check_end()
+        if self.combat_active:
+            self._end_round()
+        return damage
+
+    def _fighter(self, side):
+        return self.character if side == PLAYER else self.enemy
+
+    def _strike(self, side, other):
+        """Basic attack including any attack/defense status effects."""
+        attacker, defender = self._fighter(side), self._fighter(other)
+        damage = max(0, effective_stats(attacker).attack + self.clock.modifier(side, "attack")
+                     - effective_stats(defender).defense - self.clock.modifier(other, "defense"))
+        if self.rng.chance(CRIT_CHANCE):
+            damage *= CRIT_MULTIPLIER
+        defender["health"] = max(0, defender["health"] - damage)
+        return damage
+
+    def _use_ability(self, side, other, ability):
+        ability = get_ability_registry().get(ability)
+        remaining = self.clock.cooldown_remaining(side, ability.id)
+        if remaining:
+            raise AbilityOnCooldownError(f"{ability.name} is ready in {remaining} rounds")
+        damage = use_ability(self._fighter(side), self._fighter(other), ability.id)
+        self.clock.start_cooldown(side, ability.id, ability.cooldown)
+        if ability.effect is not None:
+            kind, amount, duration = ability.effect
+            target = other if kind == "dot" else side
+            self.clock.add_effect(target, kind, amount, duration)
+        return damage
+
+    def _end_round(self):
+        """Apply damage over time, then tick the clock."""
+        for side in (PLAYER, ENEMY):
+            dot = self.clock.modifier(side, "dot")
+            if dot:
+                fighter = self._fighter(side)
+                fighter["health"] = max(0, fighter["health"] - dot)
+        self.clock.advance()
+        self._check_end()
+
+    def _check_end(self):
+        if self.enemy["health"] <= 0:
+            self.winner = PLAYER
+            self.combat_active = False
+        elif self.character["health"] <= 0:
+            self.winner = ENEMY
+            self.combat_active = False
+
+def replay_battle(character, enemy, seed, actions):
+    """
+    Re-run a SimpleBattle from the starting character and enemy, the
+    battle's seed and its recorded player actions. The characters passed
+    in are updated exactly as in the original battle.
+    Returns the finished SimpleBattle.
+    """
+    battle = SimpleBattle(character, enemy, seed)
+    for action in actions:
+        battle.player_turn(action)
+        if battle.combat_active:
+            battle.enemy_turn()
+    return battle
+
+# ----------------------------------------------------------------------------
+# BATCH COMBAT
+# ----------------------------------------------------------------------------
+
+def battle_many(attackers, defenders):
+    """
+    Resolve many attacker-vs-defender battles at once without simulating
+    turns. Damage is deterministic, so each fight is settled with two
+    ceiling divisions. Neither side is modified.
+    attackers and defenders may be equal-length lists of characters or
+    CharacterStores (their columns are read directly).
+    Returns a dictionary of arrays, one entry per fight:
+        "winners": ATTACKER_WINS, DEFENDER_WINS or STALEMATE
+        "rounds": rounds fought
+        "attacker_health", "defender_health": health left at the end
+    Raises ValueError if the two sides have different lengths.
+    """
+    if len(attackers) != len(defenders):
+        raise ValueError("attackers and defenders must be the same length")
+
+    results = map(_resolve_battle,
+                  *_stat_columns(attackers), *_stat_columns(defenders))
+    winners = array("b")
+    rounds = array("q")
+    attacker_health = array("q")
+    defender_health = array("q")
+    for winner, fight_rounds, attacker_left, defender_left in results:
+        winners.append(winner)
+        rounds.append(fight_rounds)
+        attacker_health.append(attacker_left)
+        defender_health.append(defender_left)
+    return {
+        "winners": winners,
+        "rounds": rounds,
+        "attacker_health": attacker_health,
+        "defender_health": defender_health,
+    }
+
+def _stat_columns(fighters):
+    """
+    Return (health, attack, defense) sequences for a list or a CharacterStore,
+    using effective stats either way. A store's attack and defense columns
+    are used as-is unless some row has strength or buffs to add.
+    """
+    if isinstance(fighters, CharacterStore):
+        columns = fighters.columns
+        attack, defense = columns["attack"], columns["defense"]
+        if any(extra.get("strength") or extra.get("buffs") for extra in fighters.extras):
+            # Rows keep strength and buffs outside the columns; work out their bonus alone
+            bonuses = [compute_stats({**extra, "attack": 0, "defense": 0})
+                       for extra in fighters.extras]
+            attack = list(map(add, attack, (bonus.attack for bonus in bonuses)))
+            defense = list(map(add, defense, (bonus.defense for bonus in bonuses)))
+        return columns["health"], attack, defense
+    stats = [effective_stats(fighter) for fighter in fighters]
+    return ([fighter["health"] for fighter in fighters],
+            [fighter_stats.attack for fighter_stats in stats],
+            [fighter_stats.defense for fighter_stats in stats])
+
+def _resolve_battle(attacker_health, attacker_attack, attacker_defense,
+                    defender_health, defender_attack, defender_defense):
+    """
+    Closed-form result of battle(): the attacker strikes first each round
+    and the defender answers if still alive.
+    Returns (winner, rounds, attacker_health, defender_health).
+    """
+    if attacker_health <= 0:
+        return DEFENDER_WINS, 0, 0, max(0, defender_health)
+    if defender_health <= 0:
+        return ATTACKER_WINS, 0, attacker_health, 0
+
+    attacker_damage = max(0, attacker_attack - defender_defense)
+    defender_damage = max(0, defender_attack - attacker_defense)
+    if attacker_damage == 0 and defender_damage == 0:
+        return STALEMATE, 0, attacker_health, defender_health
+
+    # Hits each side needs to finish the other (ceiling division)
+    attacker_hits = -(-defender_health // attacker_damage) if attacker_damage else None
+    defender_hits = -(-attacker_health // defender_damage) if defender_damage else None
+
+    if defender_hits is None or (attacker_hits is not None and attacker_hits <= defender_hits):
+        # Defender only gets to answer the rounds before the killing blow
+        return (ATTACKER_WINS, attacker_hits,
+                attacker_health - (attacker_hits - 1) * defender_damage, 0)
+    return (DEFENDER_WINS, defender_hits,
+            0, defender_health - defender_hits * attacker_damage)
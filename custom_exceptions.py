@@ -50,6 +50,10 @@ class CorruptedDataError(DataError):
     """Raised when a data file is corrupted."""
     pass
 
+class SaveFileCorruptedError(DataError):
+    """Raised when a character save cannot be written or read back."""
+    pass
+
 # Character Exceptions
 class InvalidCharacterClassError(CharacterError):
     """Raised when a player selects a non-existent class."""
@@ -67,4 +71,57 @@ class InsufficientLevelError(CharacterError):
     """Raised when a character tries to accept a quest or item above their level."""
     pass
 
-# Combat
+# Quest Exceptions
+class QuestNotFoundError(QuestError):
+    """Raised when a quest id or title does not exist."""
+    pass
+
+class QuestRequirementsNotMetError(QuestError):
+    """Raised when a quest's prerequisite has not been completed."""
+    pass
+
+class QuestAlreadyAcceptedError(QuestError):
+    """Raised when accepting a quest that is already active."""
+    pass
+
+class QuestAlreadyCompletedError(QuestError):
+    """Raised when accepting a quest that was already completed."""
+    pass
+
+class QuestNotActiveError(QuestError):
+    """Raised when completing or abandoning a quest that is not active."""
+    pass
+
+# Inventory Exceptions
+class InventoryFullError(InventoryError):
+    """Raised when adding an item to a full inventory."""
+    pass
+
+class ItemNotFoundError(InventoryError):
+    """Raised when an item is not in the inventory."""
+    pass
+
+class InsufficientResourcesError(InventoryError):
+    """Raised when a character cannot afford a purchase."""
+    pass
+
+class InvalidItemTypeError(InventoryError):
+    """Raised when an item is used in a way its type does not allow."""
+    pass
+
+# Combat Exceptions
+class InvalidTargetError(CombatError):
+    """Raised when attacking a missing or invalid target."""
+    pass
+
+class CombatNotActiveError(CombatError):
+    """Raised when taking a combat action outside of an active battle."""
+    pass
+
+class AbilityOnCooldownError(CombatError):
+    """Raised when using an ability before its cooldown has finished."""
+    pass
+
+class CombatStalemateError(CombatError):
+    """Raised when neither side of a battle can damage the other."""
+    pass
@@ -0,0 +1,59 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Derived Stats Module
+
+Name: Darenell Curry
+AI Usage: AI suggested caching effective stats and clearing them when an input changes.
+"""
+
+from collections import namedtuple
+
+# Effective combat stats: base stat + equipment (through strength) + buffs
+DerivedStats = namedtuple("DerivedStats", "attack defense")
+
+# Character keys the derived stats are computed from. Character clears its
+# cached DerivedStats whenever one of these is assigned.
+DERIVED_FROM = frozenset({
+    "attack", "defense", "strength", "level",
+    "equipped_weapon", "equipped_armor", "buffs",
+})
+
+# ----------------------------------------------------------------------------
+# DERIVED STATS
+# ----------------------------------------------------------------------------
+def compute_stats(character):
+    """Work out a character's (or enemy's) effective attack and defense."""
+    buffs = character.get("buffs") or {}
+    return DerivedStats(
+        character["attack"] + character.get("strength", 0) + buffs.get("attack", 0),
+        character["defense"] + buffs.get("defense", 0),
+    )
+
+def effective_stats(character):
+    """
+    Return the DerivedStats for character.
+    Characters keep the result until an input changes; plain dictionaries
+    and enemy instances are worked out on each call.
+    """
+    cached = getattr(character, "derived_stats", None)
+    if cached is not None:
+        return cached()
+    return compute_stats(character)
+
+# ----------------------------------------------------------------------------
+# BUFFS
+# ----------------------------------------------------------------------------
+def add_buff(character, stat, amount):
+    """Add a lasting bonus (e.g. from a blessing) to "attack" or "defense"."""
+    if stat not in DerivedStats._fields:
+        raise ValueError(f"Cannot buff {stat}")
+    buffs = dict(character.get("buffs") or {})
+    buffs[stat] = buffs.get(stat, 0) + amount
+    if not buffs[stat]:
+        del buffs[stat]
+    # Assigning a new dict (not editing the old one) is what clears the cache
+    character["buffs"] = buffs
+
+def remove_buff(character, stat, amount):
+    """Take back a bonus given by add_buff()."""
+    add_buff(character, stat, -amount)
@@ -7,10 +7,86 @@ AI Usage: AI suggested centralized data loading, quest templates, and error hand
 """
 
 import json
+import marshal
+import os
+from bisect import bisect_right
+from collections.abc import Mapping
+from types import MappingProxyType
 from custom_exceptions import *
+from item_effects import compile_effect
+from templates import freeze
 
 DATA_FILE = "game_data.json"
 
+# Folder holding the bundled data files, for loaders that run outside the
+# project root
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Parsed data files are cached next to the source file as "<file>.cache".
+# Bump CACHE_VERSION whenever the parsed record layout changes so old caches
+# are ignored and rebuilt.
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 2
+
+# Field name -> expected type for each record kind
+QUEST_FIELDS = {
+    "quest_id": str,
+    "title": str,
+    "description": str,
+    "reward_xp": int,
+    "reward_gold": int,
+    "required_level": int,
+    "prerequisite": str,
+}
+
+ITEM_FIELDS = {
+    "item_id": str,
+    "name": str,
+    "type": str,
+    "effect": str,
+    "cost": int,
+    "description": str,
+}
+
+# Optional item fields: MAX_STACK (items per inventory slot) defaults to 1
+OPTIONAL_ITEM_FIELDS = {
+    "max_stack": int,
+}
+
+VALID_ITEM_TYPES = ["weapon", "armor", "consumable"]
+
+ABILITY_FIELDS = {
+    "ability_id": str,
+    "name": str,
+    "damage": int,
+    "heal": int,
+    "cost": int,
+    "cooldown": int,
+    "effect": str,
+    "description": str,
+}
+
+ENEMY_FIELDS = {
+    "enemy_id": str,
+    "name": str,
+    "health": int,
+    "attack": int,
+    "defense": int,
+    "health_per_level": int,
+    "attack_per_level": int,
+    "defense_per_level": int,
+    "xp_reward": int,
+    "gold_reward": int,
+    "min_level": int,
+    "max_level": int,
+    "weight": int,
+    "description": str,
+}
+
+# Status effects an ability can apply, as "kind:amount:duration" or NONE.
+# dot hits the target every round; attack/defense modify the user.
+VALID_ABILITY_EFFECTS = ["dot", "attack", "defense"]
+
 # ----------------------------------------------------------------------------
 # LOAD GAME DATA
 # ----------------------------------------------------------------------------
@@ -29,16 +105,434 @@ def load_game_data():
     except json.JSONDecodeError:
         raise CorruptedDataError(f"{DATA_FILE} is corrupted")
 
+def load_quests(filename="data/quests.txt"):
+    """
+    Load quests from a KEY: VALUE block file.
+    Returns a dictionary of quest_id -> quest dictionary.
+    Raises:
+        MissingDataFileError: if the file does not exist.
+        InvalidDataFormatError: if a block is malformed or fails validation.
+    """
+    return _load_records(filename, "quest_id", QUEST_FIELDS, validate_quest_data)
+
+def load_items(filename="data/items.txt"):
+    """
+    Load items from a KEY: VALUE block file.
+    Returns a dictionary of item_id -> item dictionary.
+    Raises:
+        MissingDataFileError: if the file does not exist.
+        InvalidDataFormatError: if a block is malformed or fails validation.
+    """
+    return _load_records(filename, "item_id", {**ITEM_FIELDS, **OPTIONAL_ITEM_FIELDS},
+                         validate_item_data)
+
+def load_abilities(filename="data/abilities.txt"):
+    """
+    Load combat abilities from a KEY: VALUE block file.
+    Returns a dictionary of ability_id -> ability dictionary.
+    Raises:
+        MissingDataFileError: if the file does not exist.
+        InvalidDataFormatError: if a block is malformed or fails validation.
+    """
+    return _load_records(filename, "ability_id", ABILITY_FIELDS, validate_ability_data)
+
+def load_enemies(filename="data/enemies.txt"):
+    """
+    Load enemy templates from a KEY: VALUE block file.
+    Returns a dictionary of enemy_id -> enemy dictionary.
+    Raises:
+        MissingDataFileError: if the file does not exist.
+        InvalidDataFormatError: if a block is malformed or fails validation.
+    """
+    return _load_records(filename, "enemy_id", ENEMY_FIELDS, validate_enemy_data)
+
+# Shared read-only catalogs, loaded from DATA_DIR the first time one of
+# game_data.ITEMS, game_data.QUESTS or game_data.ENEMIES is used
+_CATALOG_FILES = {
+    "ITEMS": "items.txt",
+    "QUESTS": "quests.txt",
+    "ENEMIES": "enemies.txt",
+}
+
+def __getattr__(name):
+    """
+    Load ITEMS, QUESTS and ENEMIES lazily. ITEMS and ENEMIES map ids to
+    read-only records; QUESTS is a QuestCatalog. They are shared by every
+    caller, so nothing needs to copy them.
+    """
+    if name not in _CATALOG_FILES:
+        raise AttributeError(f"module 'game_data' has no attribute '{name}'")
+    filename = os.path.join(DATA_DIR, _CATALOG_FILES[name])
+    if name == "ITEMS":
+        catalog = MappingProxyType({item_id: freeze(item) for item_id, item in load_items(filename).items()})
+    elif name == "QUESTS":
+        catalog = QuestCatalog(load_quests(filename))
+    else:
+        catalog = MappingProxyType({enemy_id: freeze(enemy)
+                                    for enemy_id, enemy in load_enemies(filename).items()})
+    globals()[name] = catalog
+    return catalog
+
+# ----------------------------------------------------------------------------
+# VALIDATION
+# ----------------------------------------------------------------------------
+def validate_quest_data(quest):
+    """
+    Check that a quest has every required field with the right type.
+    Returns True if valid.
+    Raises InvalidDataFormatError otherwise.
+    """
+    _check_fields(quest, QUEST_FIELDS, "quest")
+    if quest["required_level"] < 1:
+        raise InvalidDataFormatError(f"Quest '{quest['quest_id']}' has an invalid level")
+    return True
+
+def validate_item_data(item):
+    """
+    Check that an item has every required field with the right type.
+    Returns True if valid.
+    Raises InvalidDataFormatError otherwise.
+    """
+    _check_fields(item, ITEM_FIELDS, "item")
+    if item["type"] not in VALID_ITEM_TYPES:
+        raise InvalidDataFormatError(f"Item '{item['item_id']}' has unknown type {item['type']}")
+    try:
+        compile_effect(item["effect"])
+    except InvalidDataFormatError:
+        raise InvalidDataFormatError(f"Item '{item['item_id']}' has a bad effect: {item['effect']}")
+    max_stack = item.get("max_stack", 1)
+    if not isinstance(max_stack, int) or max_stack < 1:
+        raise InvalidDataFormatError(f"Item '{item['item_id']}' needs a MAX_STACK of at least 1")
+    return True
+
+def validate_ability_data(ability):
+    """
+    Check that an ability has every required field with the right type.
+    Returns True if valid.
+    Raises InvalidDataFormatError otherwise.
+    """
+    _check_fields(ability, ABILITY_FIELDS, "ability")
+    for field in ("damage", "heal", "cost", "cooldown"):
+        if ability[field] < 0:
+            raise InvalidDataFormatError(f"Ability '{ability['ability_id']}' has negative {field}")
+    if ability["effect"] != "NONE":
+        parts = ability["effect"].split(":")
+        try:
+            valid = (len(parts) == 3 and parts[0] in VALID_ABILITY_EFFECTS
+                     and int(parts[2]) > 0 and int(parts[1]) != 0)
+        except ValueError:
+            valid = False
+        if not valid:
+            raise InvalidDataFormatError(
+                f"Ability '{ability['ability_id']}' has a bad effect: {ability['effect']}")
+    return True
+
+def validate_enemy_data(enemy):
+    """
+    Check that an enemy has every required field with sensible values.
+    Returns True if valid.
+    Raises InvalidDataFormatError otherwise.
+    """
+    _check_fields(enemy, ENEMY_FIELDS, "enemy")
+    if enemy["health"] <= 0 or enemy["weight"] <= 0:
+        raise InvalidDataFormatError(f"Enemy '{enemy['enemy_id']}' needs positive health and weight")
+    if not 1 <= enemy["min_level"] <= enemy["max_level"]:
+        raise InvalidDataFormatError(f"Enemy '{enemy['enemy_id']}' has an invalid level range")
+    return True
+
+def _check_fields(record, fields, kind):
+    """Raise InvalidDataFormatError if a field is missing or has the wrong type."""
+    for field, field_type in fields.items():
+        if field not in record:
+            raise InvalidDataFormatError(f"{kind} is missing field '{field}'")
+        if not isinstance(record[field], field_type):
+            raise InvalidDataFormatError(f"{kind} field '{field}' must be {field_type.__name__}")
+
+# ----------------------------------------------------------------------------
+# BLOCK PARSER AND CACHE
+# ----------------------------------------------------------------------------
+def _load_records(filename, id_field, fields, validator):
+    """
+    Return id -> record for a data file, using the compiled cache when the
+    file's mtime and size still match what the cache was built from.
+    """
+    try:
+        file_stat = os.stat(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{filename} is missing")
+
+    records = _read_cache(filename, id_field, file_stat)
+    if records is not None:
+        return records
+
+    records = {}
+    with open(filename) as f:
+        for record in _parse_blocks(f, filename):
+            record = _convert_record(record, fields, filename)
+            validator(record)
+            record_id = record[id_field]
+            if record_id in records:
+                raise InvalidDataFormatError(f"{filename}: duplicate id '{record_id}'")
+            records[record_id] = record
+
+    if not records:
+        raise InvalidDataFormatError(f"{filename} contains no records")
+
+    _write_cache(filename, id_field, file_stat, records)
+    return records
+
+def _parse_blocks(lines, filename):
+    """
+    Yield one raw {key: value} dictionary per blank-line separated block.
+    Keys are lowercased; values are stripped strings.
+    Lines are consumed one at a time so the file is never held in memory.
+    """
+    block = {}
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            if block:
+                yield block
+                block = {}
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip():
+            raise InvalidDataFormatError(f"{filename}:{line_number}: expected 'KEY: VALUE'")
+        block[key.strip().lower()] = value.strip()
+    if block:
+        yield block
+
+def _convert_record(record, fields, filename):
+    """Convert numeric fields of a raw block to int."""
+    for field, field_type in fields.items():
+        if field_type is int and field in record:
+            try:
+                record[field] = int(record[field])
+            except ValueError:
+                raise InvalidDataFormatError(f"{filename}: '{field}' must be a number")
+    return record
+
+def _cache_path(filename):
+    return filename + CACHE_SUFFIX
+
+def _read_cache(filename, id_field, stat):
+    """Return cached records, or None if the cache is missing or stale."""
+    try:
+        with open(_cache_path(filename), "rb") as f:
+            version, kind, mtime_ns, size, records = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (version, kind, mtime_ns, size) != (CACHE_VERSION, id_field, stat.st_mtime_ns, stat.st_size):
+        return None
+    return records
+
+def _write_cache(filename, id_field, stat, records):
+    """Write the compiled cache. Failures are ignored; the cache is optional."""
+    path = _cache_path(filename)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            marshal.dump((CACHE_VERSION, id_field, stat.st_mtime_ns, stat.st_size, records), f)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
 # ----------------------------------------------------------------------------
 # QUEST DATA
 # ----------------------------------------------------------------------------
-def get_quest_by_name(name, game_data):
+class QuestCatalog(Mapping):
+    """
+    Read-only quest lookup built once from load_quests() output.
+
+    Acts like the quest_id -> quest dictionary it was built from, plus
+    O(1) lookup by title and indexes by required level and prerequisite.
+    Quest records are exposed as read-only mappings.
+
+    The prerequisite graph is compiled at build time: quests are numbered
+    in topological order and each one gets a bitmask of every quest it
+    transitively requires, so availability checks are integer operations.
+    Raises InvalidDataFormatError if the prerequisites form a cycle.
+    """
+
+    __slots__ = ("_quests", "_by_title", "_by_level", "_levels", "_by_prerequisite",
+                 "_order", "_bits", "_requires", "_level_masks")
+
+    def __init__(self, quests):
+        by_id = {}
+        by_title = {}
+        by_level = {}
+        by_prerequisite = {}
+        for quest_id, quest in quests.items():
+            quest = MappingProxyType(dict(quest))
+            by_id[quest_id] = quest
+            if "title" in quest:
+                by_title[quest["title"]] = quest
+            by_level.setdefault(quest.get("required_level", 1), []).append(quest_id)
+            by_prerequisite.setdefault(quest.get("prerequisite", "NONE"), []).append(quest_id)
+
+        # Quest ids ordered by required level, with the end offset of each
+        # level, so "everything up to level N" is a bisect plus a slice.
+        levels = sorted(by_level)
+        ordered_ids = []
+        level_ends = []
+        for level in levels:
+            ordered_ids.extend(by_level[level])
+            level_ends.append(len(ordered_ids))
+
+        object.__setattr__(self, "_quests", by_id)
+        object.__setattr__(self, "_by_title", by_title)
+        object.__setattr__(self, "_by_level", {level: tuple(ids) for level, ids in by_level.items()})
+        object.__setattr__(self, "_levels", (levels, level_ends, tuple(ordered_ids)))
+        object.__setattr__(self, "_by_prerequisite",
+                           {prereq: tuple(ids) for prereq, ids in by_prerequisite.items()})
+
+        order = _topological_order(by_id, self._by_prerequisite)
+        bits = {quest_id: 1 << index for index, quest_id in enumerate(order)}
+        # Prerequisites that are not in this catalog still get a bit, after
+        # the real quests, so they can only be satisfied by a character that
+        # completed them elsewhere.
+        for prereq in by_prerequisite:
+            if prereq != "NONE" and prereq not in bits:
+                bits[prereq] = 1 << len(bits)
+
+        # A quest requires its prerequisite plus everything that requires;
+        # topological order guarantees the prerequisite's mask is ready.
+        requires = []
+        for quest_id in order:
+            prereq = by_id[quest_id].get("prerequisite", "NONE")
+            if prereq == "NONE":
+                requires.append(0)
+            elif prereq in by_id:
+                requires.append(bits[prereq] | requires[bits[prereq].bit_length() - 1])
+            else:
+                requires.append(bits[prereq])
+
+        level_masks = []
+        mask = 0
+        for level in levels:
+            for quest_id in by_level[level]:
+                mask |= bits[quest_id]
+            level_masks.append(mask)
+
+        object.__setattr__(self, "_order", tuple(order))
+        object.__setattr__(self, "_bits", bits)
+        object.__setattr__(self, "_requires", tuple(requires))
+        object.__setattr__(self, "_level_masks", tuple(level_masks))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestCatalog is read-only")
+
+    def __getitem__(self, quest_id):
+        return self._quests[quest_id]
+
+    def __iter__(self):
+        return iter(self._quests)
+
+    def __len__(self):
+        return len(self._quests)
+
+    def find(self, name):
+        """
+        Look up a quest by quest id or title.
+        Raises QuestNotFoundError if neither matches.
+        """
+        quest = self._quests.get(name)
+        if quest is None:
+            quest = self._by_title.get(name)
+        if quest is None:
+            raise QuestNotFoundError(f"Quest '{name}' not found")
+        return quest
+
+    def quests_at_level(self, level):
+        """Return the ids of quests whose required level is exactly level."""
+        return self._by_level.get(level, ())
+
+    def quests_up_to_level(self, level):
+        """Return the ids of quests a character of this level meets the level for."""
+        levels, level_ends, ordered_ids = self._levels
+        index = bisect_right(levels, level)
+        return ordered_ids[:level_ends[index - 1]] if index else ()
+
+    def unlocked_by(self, quest_id):
+        """Return the ids of quests whose prerequisite is quest_id."""
+        return self._by_prerequisite.get(quest_id, ())
+
+    def topological_order(self):
+        """Return quest ids ordered so every quest comes after its prerequisite."""
+        return self._order
+
+    def requirements(self, quest_id):
+        """Return every quest id that quest_id transitively requires."""
+        required = self._requires[self._order_index(quest_id)]
+        return [other for other, bit in self._bits.items() if required & bit]
+
+    def mask_of(self, quest_ids):
+        """Return the bitmask for a collection of quest ids; unknown ids are ignored."""
+        bits = self._bits
+        mask = 0
+        for quest_id in quest_ids:
+            mask |= bits.get(quest_id, 0)
+        return mask
+
+    def available_quests(self, character):
+        """
+        Return the ids of quests this character could accept right now,
+        in topological order: level is high enough, not active or
+        completed, and every transitive prerequisite is completed.
+        """
+        done = self.mask_of(character["completed_quests"])
+        active = self.mask_of(character["active_quests"])
+        levels = self._levels[0]
+        index = bisect_right(levels, character["level"])
+        if not index:
+            return []
+
+        candidates = self._level_masks[index - 1] & ~done & ~active
+        requires = self._requires
+        order = self._order
+        available = []
+        while candidates:
+            low_bit = candidates & -candidates
+            position = low_bit.bit_length() - 1
+            if not requires[position] & ~done:
+                available.append(order[position])
+            candidates ^= low_bit
+        return available
+
+    def _order_index(self, quest_id):
+        if quest_id not in self._quests:
+            raise QuestNotFoundError(f"Quest '{quest_id}' not found")
+        return self._bits[quest_id].bit_length() - 1
+
+def _topological_order(quests, by_prerequisite):
+    """
+    Order quest ids so each quest follows its prerequisite (Kahn's algorithm).
+    Raises InvalidDataFormatError if the prerequisites contain a cycle.
+    """
+    # Start from quests whose prerequisite is outside the catalog; the list
+    # grows while it is walked, giving a breadth-first order.
+    order = [quest_id for quest_id, quest in quests.items()
+             if quest.get("prerequisite", "NONE") not in quests]
+    for quest_id in order:
+        order.extend(by_prerequisite.get(quest_id, ()))
+
+    if len(order) != len(quests):
+        stuck = sorted(set(quests) - set(order))
+        raise InvalidDataFormatError(f"Quest prerequisites form a cycle: {', '.join(stuck)}")
+    return order
+
+def get_quest_by_name(name, quests):
     """
-    Retrieve quest dictionary by name.
+    Retrieve a quest dictionary by id (or title, for a QuestCatalog).
+    quests may be a QuestCatalog or the dictionary from load_quests().
     Raises QuestNotFoundError if quest is not found.
     """
-    quests = game_data.get("quests", [])
-    for quest in quests:
-        if quest["name"] == name:
-            return quest
-    raise QuestNotFoundError(f"Quest '{name}' not found")
+    if isinstance(quests, QuestCatalog):
+        return quests.find(name)
+    quest = quests.get(name)
+    if quest is None:
+        raise QuestNotFoundError(f"Quest '{name}' not found")
+    return quest
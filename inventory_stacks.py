@@ -0,0 +1,176 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Inventory Stacks Module
+
+Name: Darenell Curry
+AI Usage: AI suggested storing item counts per id with running slot totals.
+"""
+
+from custom_exceptions import *
+import game_data
+
+_stack_limits = None
+
+def stack_limit(item_id):
+    """Return how many of item_id fit in one slot (MAX_STACK, default 1)."""
+    global _stack_limits
+    if _stack_limits is None:
+        _stack_limits = {item_id: item.get("max_stack", 1)
+                         for item_id, item in game_data.ITEMS.items()}
+    return _stack_limits.get(item_id, 1)
+
+def _slots_for(item_id, count):
+    limit = stack_limit(item_id)
+    return -(-count // limit)
+
+# ----------------------------------------------------------------------------
+# INVENTORY
+# ----------------------------------------------------------------------------
+class Inventory:
+    """
+    Stacked inventory: item_id -> count, plus a running total of slots.
+
+    An item takes ceil(count / MAX_STACK) slots, so ten Health Potions use
+    one slot. Adding, removing and checking an item are O(1). Iterating
+    yields one item id per item held, so len(), "in" and list(inventory)
+    behave like the plain list inventories in older save files, and
+    to_list() produces that list for saving.
+
+    After track() the ids whose count changes are remembered, so a save
+    can write just their new counts (see take_changes()).
+    """
+
+    __slots__ = ("_counts", "_slots_used", "_touched")
+
+    def __init__(self, item_ids=()):
+        self._counts = {}
+        self._slots_used = 0
+        self._touched = None
+        for item_id in item_ids:
+            self.add(item_id)
+
+    @property
+    def slots_used(self):
+        return self._slots_used
+
+    def count(self, item_id):
+        """Return how many of item_id are held."""
+        return self._counts.get(item_id, 0)
+
+    def add(self, item_id, quantity=1, capacity=None):
+        """
+        Add quantity of item_id.
+        Raises InventoryFullError if the new stacks would need more than
+        capacity slots (no limit when capacity is None).
+        Raises ValueError if quantity is not a positive integer.
+        """
+        check_quantity(item_id, quantity)
+        old_count = self._counts.get(item_id, 0)
+        new_count = old_count + quantity
+        new_slots = self._slots_used + _slots_for(item_id, new_count) - _slots_for(item_id, old_count)
+        if capacity is not None and new_slots > capacity:
+            raise InventoryFullError("Inventory is full")
+        self._counts[item_id] = new_count
+        self._slots_used = new_slots
+        if self._touched is not None:
+            self._touched.add(item_id)
+
+    def remove(self, item_id, quantity=1):
+        """
+        Remove quantity of item_id.
+        Raises ItemNotFoundError if fewer than quantity are held.
+        Raises ValueError if quantity is not a positive integer.
+        """
+        check_quantity(item_id, quantity)
+        old_count = self._counts.get(item_id, 0)
+        if old_count < quantity:
+            raise ItemNotFoundError(f"{item_id} not found in inventory")
+        new_count = old_count - quantity
+        self._slots_used += _slots_for(item_id, new_count) - _slots_for(item_id, old_count)
+        if new_count:
+            self._counts[item_id] = new_count
+        else:
+            del self._counts[item_id]
+        if self._touched is not None:
+            self._touched.add(item_id)
+
+    def slots_after(self, changes):
+        """
+        Return the slots that would be used after applying changes
+        (item_id -> quantity to add, negative to remove), without applying them.
+        """
+        slots = self._slots_used
+        for item_id, delta in changes.items():
+            old_count = self._counts.get(item_id, 0)
+            slots += _slots_for(item_id, old_count + delta) - _slots_for(item_id, old_count)
+        return slots
+
+    def track(self):
+        """Start (or restart) remembering which item counts change."""
+        self._touched = set()
+
+    def has_changes(self):
+        """Return True if take_changes() would report anything."""
+        return self._touched is None or bool(self._touched)
+
+    def take_changes(self):
+        """
+        Return {item_id: new count} for the items changed since track()
+        (0 = none left) and keep tracking from here. Returns None if the
+        inventory was never tracked and should be saved whole.
+        """
+        touched = self._touched
+        self._touched = set()
+        if touched is None:
+            return None
+        return {item_id: self._counts.get(item_id, 0) for item_id in touched}
+
+    def append(self, item_id):
+        """List-style add of one item, with no capacity check."""
+        self.add(item_id)
+
+    def stacks(self):
+        """Return (item_id, count) pairs."""
+        return list(self._counts.items())
+
+    def to_list(self):
+        """Return the flat list of item ids stored in save files."""
+        return [item_id for item_id, count in self._counts.items() for _ in range(count)]
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, list):
+            return self._counts == Inventory(other)._counts
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({self._counts!r})"
+
+# ----------------------------------------------------------------------------
+# HELPERS
+# ----------------------------------------------------------------------------
+def check_quantity(item_id, quantity):
+    """Raise ValueError unless quantity is a positive integer."""
+    if not isinstance(quantity, int) or quantity < 1:
+        raise ValueError(f"Bad quantity for {item_id}: {quantity}")
+
+def inventory_of(character):
+    """
+    Return character["inventory"] as an Inventory, converting a plain list
+    in place the first time.
+    """
+    inventory = character["inventory"]
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory)
+        character["inventory"] = inventory
+    return inventory
@@ -7,43 +7,173 @@ AI Usage: AI suggested basic add/remove mechanics and error handling.
 """
 
 from custom_exceptions import *
+from inventory_stacks import check_quantity, inventory_of
+from item_effects import apply_effect, compile_effect
 
+# Inventory slots per character. Stackable items (MAX_STACK in
+# data/items.txt) share a slot up to their stack limit.
 MAX_INVENTORY = 20
+MAX_INVENTORY_SIZE = MAX_INVENTORY
 
-def add_item(character, item):
+def add_item_to_inventory(character, item_id, quantity=1):
     """
-    Add an item to character inventory.
+    Add quantity of an item to character inventory.
     Raises:
-        InventoryFullError if inventory exceeds limit.
+        InventoryFullError if the items need more than MAX_INVENTORY slots.
     """
-    if len(character["inventory"]) >= MAX_INVENTORY:
-        raise InventoryFullError("Inventory is full")
-    character["inventory"].append(item)
+    inventory_of(character).add(item_id, quantity, MAX_INVENTORY)
 
-def remove_item(character, item):
+def remove_item_from_inventory(character, item_id, quantity=1):
     """
-    Remove an item from inventory.
-    Raises ItemNotFoundError if item not in inventory.
+    Remove quantity of an item from inventory.
+    Raises ItemNotFoundError if fewer than quantity are held.
     """
-    if item not in character["inventory"]:
-        raise ItemNotFoundError(f"{item} not found in inventory")
-    character["inventory"].remove(item)
+    inventory_of(character).remove(item_id, quantity)
 
-def use_item(character, item):
+# Older names, kept for existing callers
+add_item = add_item_to_inventory
+remove_item = remove_item_from_inventory
+
+# ----------------------------------------------------------------------------
+# USING AND EQUIPPING ITEMS
+# ----------------------------------------------------------------------------
+def use_item(character, item_id, item_data, quantity=1):
+    """
+    Use quantity of a consumable, applying its EFFECT once per item in a
+    single step (e.g. drinking 3 potions heals 3x, capped at max_health).
+    Returns a message describing the result.
+    Raises:
+        InvalidItemTypeError if the item is not a consumable.
+        ItemNotFoundError if fewer than quantity are held.
+        ValueError if quantity is not a positive integer.
+    """
+    _check_quantities({item_id: quantity})
+    if item_data["type"] != "consumable":
+        raise InvalidItemTypeError(f"{item_id} cannot be used")
+    effect = compile_effect(item_data["effect"])
+    inventory_of(character).remove(item_id, quantity)
+    value = apply_effect(character, effect, quantity)
+    return f"Used {quantity} x {item_id}: {effect.stat} is now {value}"
+
+def equip_weapon(character, item_id, item_data):
+    """
+    Equip a weapon from the inventory, unequipping the current one.
+    Raises InvalidItemTypeError if the item is not a weapon.
+    """
+    return _equip(character, "equipped_weapon", item_id, item_data, "weapon")
+
+def equip_armor(character, item_id, item_data):
+    """
+    Equip armor from the inventory, unequipping the current armor.
+    Raises InvalidItemTypeError if the item is not armor.
+    """
+    return _equip(character, "equipped_armor", item_id, item_data, "armor")
+
+def unequip_item(character, slot):
+    """
+    Take off the item in slot ("equipped_weapon" or "equipped_armor"),
+    undo its effect and put it back in the inventory.
+    Returns the item id, or None if nothing was equipped.
+    Raises InventoryFullError if there is no room for it.
+    """
+    item_id = character.get(slot)
+    if item_id is None:
+        return None
+    inventory_of(character).add(item_id, 1, MAX_INVENTORY)
+    apply_effect(character, compile_effect(character[slot + "_effect"]), -1)
+    del character[slot]
+    del character[slot + "_effect"]
+    return item_id
+
+def _equip(character, slot, item_id, item_data, item_type):
+    """
+    Move item_id from the inventory into slot and apply its effect.
+    The EFFECT string is kept next to the slot so the bonus can be undone
+    later without looking the item up again.
     """
-    Use an item. AI suggested simple item effect mechanics.
-    Currently supports:
-      - "Health Potion": heals 20 HP
-      - "Mana Potion": placeholder
+    if item_data["type"] != item_type:
+        raise InvalidItemTypeError(f"{item_id} is not {item_type}")
+    effect = compile_effect(item_data["effect"])
+    inventory = inventory_of(character)
+    inventory.remove(item_id)
+    try:
+        unequip_item(character, slot)
+    except InventoryFullError:
+        inventory.add(item_id)
+        raise
+    apply_effect(character, effect)
+    character[slot] = item_id
+    character[slot + "_effect"] = item_data["effect"]
+    return f"Equipped {item_id}"
+
+# ----------------------------------------------------------------------------
+# BUYING AND SELLING
+# ----------------------------------------------------------------------------
+def purchase_item(character, item_id, item_data, quantity=1):
+    """
+    Buy quantity of an item at its COST.
+    Raises:
+        InsufficientResourcesError if the character cannot afford it.
+        InventoryFullError if there is no room for it.
+    """
+    return purchase_many(character, {item_id: quantity}, {item_id: item_data["cost"]})
+
+def sell_item(character, item_id, item_data, quantity=1):
+    """
+    Sell quantity of an item for half its COST each.
+    Returns the gold received.
+    Raises ItemNotFoundError if fewer than quantity are held.
+    """
+    return sell_many(character, {item_id: quantity}, {item_id: item_data["cost"]})
+
+def purchase_many(character, order, prices):
     """
-    if item not in character["inventory"]:
-        raise ItemNotFoundError(f"{item} not found in inventory")
-    
-    if item == "Health Potion":
-        character["health"] = min(character["max_health"], character["health"] + 20)
-    elif item == "Mana Potion":
-        pass  # Placeholder for mana system
-    else:
-        raise InvalidItemTypeError(f"{item} cannot be used")
+    Buy several items at once. order maps item_id -> quantity and prices
+    maps item_id -> cost. Gold and inventory room are checked for the
+    whole order before anything changes, so either every item is bought
+    or none is. Returns the gold spent.
+    Raises:
+        ItemNotFoundError if an item has no price.
+        InsufficientResourcesError if the order costs more than the character has.
+        InventoryFullError if the items need more than MAX_INVENTORY slots.
+    """
+    _check_quantities(order)
+    try:
+        total = sum(prices[item_id] * quantity for item_id, quantity in order.items())
+    except KeyError as error:
+        raise ItemNotFoundError(f"{error.args[0]} is not for sale")
+    if total > character["gold"]:
+        raise InsufficientResourcesError(f"Need {total} gold, have {character['gold']}")
+    inventory = inventory_of(character)
+    if inventory.slots_after(order) > MAX_INVENTORY:
+        raise InventoryFullError("Not enough inventory space for this purchase")
+
+    for item_id, quantity in order.items():
+        inventory.add(item_id, quantity)
+    character["gold"] -= total
+    return total
+
+def sell_many(character, order, prices):
+    """
+    Sell several items at once for half their cost each. Every item is
+    checked before any is removed. Returns the gold received.
+    Raises ItemNotFoundError if an item is not held in that quantity or
+    has no price.
+    """
+    _check_quantities(order)
+    inventory = inventory_of(character)
+    for item_id, quantity in order.items():
+        if inventory.count(item_id) < quantity:
+            raise ItemNotFoundError(f"Not enough {item_id} to sell")
+        if item_id not in prices:
+            raise ItemNotFoundError(f"{item_id} cannot be sold here")
+
+    total = sum(prices[item_id] // 2 * quantity for item_id, quantity in order.items())
+    for item_id, quantity in order.items():
+        inventory.remove(item_id, quantity)
+    character["gold"] += total
+    return total
 
-    character["inventory"].remove(item)
+def _check_quantities(order):
+    for item_id, quantity in order.items():
+        check_quantity(item_id, quantity)
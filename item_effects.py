@@ -0,0 +1,68 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Item Effects Module
+
+Name: Darenell Curry
+AI Usage: AI suggested compiling EFFECT strings once into small operation tuples.
+"""
+
+from collections import namedtuple
+
+from custom_exceptions import *
+
+# One compiled EFFECT: add delta to stat, then cap it at the stat named by
+# clamp (None = no cap). "health:20" -> Effect("health", 20, "max_health").
+Effect = namedtuple("Effect", "stat delta clamp")
+
+# Stats that may never go above another stat
+CLAMPS = {
+    "health": "max_health",
+}
+
+# Reverse of CLAMPS: when a cap drops, the stat under it is pulled down too
+CAPPED_BY = {cap: stat for stat, cap in CLAMPS.items()}
+
+# Stats an item EFFECT may change
+EFFECT_STATS = ("health", "max_health", "strength", "magic", "attack", "defense")
+
+_compiled = {}
+
+# ----------------------------------------------------------------------------
+# COMPILING
+# ----------------------------------------------------------------------------
+def compile_effect(effect):
+    """
+    Return the Effect for an EFFECT string such as "health:20".
+    Each distinct string is parsed once and the result reused.
+    Raises InvalidDataFormatError for an unknown stat or a bad amount.
+    """
+    compiled = _compiled.get(effect)
+    if compiled is None:
+        stat, _, amount = effect.partition(":")
+        if stat not in EFFECT_STATS:
+            raise InvalidDataFormatError(f"Unknown effect stat: {effect}")
+        try:
+            delta = int(amount)
+        except ValueError:
+            raise InvalidDataFormatError(f"Bad effect amount: {effect}")
+        compiled = _compiled[effect] = Effect(stat, delta, CLAMPS.get(stat))
+    return compiled
+
+# ----------------------------------------------------------------------------
+# APPLYING
+# ----------------------------------------------------------------------------
+def apply_effect(character, effect, times=1):
+    """
+    Apply a compiled effect times times in one step (negative times undoes
+    it, e.g. when unequipping). Returns the stat's new value.
+    """
+    stat, delta, clamp = effect
+    value = character.get(stat, 0) + delta * times
+    if clamp is not None:
+        value = min(value, character[clamp])
+    character[stat] = value
+
+    capped = CAPPED_BY.get(stat)
+    if capped is not None and character.get(capped, 0) > value:
+        character[capped] = value
+    return value
@@ -0,0 +1,77 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Leveling Module
+
+Name: Darenell Curry
+AI Usage: AI suggested cumulative XP tables with binary search for level lookups.
+"""
+
+from bisect import bisect_right
+
+# ----------------------------------------------------------------------------
+# LEVEL CURVE
+# ----------------------------------------------------------------------------
+class LevelCurve:
+    """
+    XP thresholds and per-level stat gains.
+
+    thresholds[i] is the XP needed to go from level i + 1 to level i + 2.
+    Levels past the end of the table keep costing the last threshold, so
+    the curve covers any level without growing the table.
+
+    A character's "experience" is the XP earned inside its current level;
+    the curve converts (level, experience) to a running total and back
+    with a binary search over the cumulative table.
+    """
+
+    def __init__(self, thresholds, health_per_level=10, attack_per_level=2, defense_per_level=1):
+        if not thresholds or any(cost <= 0 for cost in thresholds):
+            raise ValueError("Level thresholds must be positive numbers")
+        self.thresholds = tuple(thresholds)
+        self.health_per_level = health_per_level
+        self.attack_per_level = attack_per_level
+        self.defense_per_level = defense_per_level
+
+        # cumulative[i] = total XP needed to reach level i + 1
+        cumulative = [0]
+        for cost in self.thresholds:
+            cumulative.append(cumulative[-1] + cost)
+        self.cumulative = tuple(cumulative)
+
+    def total_xp(self, level, experience):
+        """Return the total XP a character at this level and progress has earned."""
+        table_levels = len(self.cumulative)
+        if level <= table_levels:
+            return self.cumulative[level - 1] + experience
+        return self.cumulative[-1] + (level - table_levels) * self.thresholds[-1] + experience
+
+    def level_for(self, total_xp):
+        """Return (level, experience into that level) for a total XP amount."""
+        if total_xp < self.cumulative[-1]:
+            index = bisect_right(self.cumulative, total_xp) - 1
+            return index + 1, total_xp - self.cumulative[index]
+        extra_levels, experience = divmod(total_xp - self.cumulative[-1], self.thresholds[-1])
+        return len(self.cumulative) + extra_levels, experience
+
+    def xp_to_next_level(self, level):
+        """Return the XP needed to go from level to level + 1."""
+        return self.thresholds[min(level, len(self.thresholds)) - 1]
+
+    def apply_experience(self, character, xp):
+        """
+        Add xp to character, applying every level-up and its stat gains in
+        one step. Health is restored to full when at least one level is
+        gained. Returns the number of levels gained.
+        """
+        total = self.total_xp(character["level"], character["experience"]) + xp
+        level, experience = self.level_for(total)
+        levels = level - character["level"]
+
+        character["level"] = level
+        character["experience"] = experience
+        if levels > 0:
+            character["max_health"] += levels * self.health_per_level
+            character["attack"] += levels * self.attack_per_level
+            character["defense"] += levels * self.defense_per_level
+            character["health"] = character["max_health"]
+        return levels
@@ -14,7 +14,7 @@ from game_data import *
 
 def main():
     # Load game data
-    game_data = load_game_data()
+    quests = QuestCatalog(load_quests())
 
     # Create or load character
     name = "Hero"
@@ -28,15 +28,15 @@ def main():
     print(f"{character['name']} - Level {character['level']} - HP {character['health']}/{character['max_health']}")
 
     # Accept first quest
-    first_quest = game_data["quests"][0]
+    first_quest = quests.find("first_steps")
     try:
-        accept_quest(character, first_quest)
-        print(f"Accepted quest: {first_quest['name']}")
+        accept_quest(character, first_quest["quest_id"], quests)
+        print(f"Accepted quest: {first_quest['title']}")
     except Exception as e:
         print(f"Quest error: {e}")
 
     # Simple battle test
-    enemy = {"name": "Goblin", "health": 30, "attack": 3, "defense": 1, "max_health": 30}
+    enemy = create_enemy("goblin", character["level"])
     winner = battle(character, enemy)
     print(f"{winner['name']} won the battle!")
 
@@ -59,10 +59,9 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+from shop import get_shop
 from custom_exceptions import *
 
-from copy import deepcopy
-
 # ============================================================================
 # GLOBAL STATE
 # ============================================================================
@@ -79,11 +78,14 @@ all_enemies = {}
 # ============================================================================
 
 def load_game_data():
-    """Load static data from game_data safely (required by tests)."""
+    """
+    Load static data from game_data safely (required by tests).
+    The catalogs are read-only and shared, so they are not copied.
+    """
     global all_items, all_quests, all_enemies
-    all_items = deepcopy(getattr(game_data, "ITEMS", {}))
-    all_quests = deepcopy(getattr(game_data, "QUESTS", {}))
-    all_enemies = deepcopy(getattr(game_data, "ENEMIES", {}))
+    all_items = game_data.ITEMS
+    all_quests = game_data.QUESTS
+    all_enemies = game_data.ENEMIES
     return True   # integration tests expect True return
 
 
@@ -178,7 +180,9 @@ def save_game():
     if current_character is None:
         print("No character loaded.")
         return False
-    return character_manager.save_character(current_character)
+    saved = character_manager.save_character(current_character)
+    character_manager.flush_saves()
+    return saved
 
 
 def game_loop():
@@ -227,5 +231,43 @@ def explore():
 # ============================================================================
 
 def shop():
-    """Required by tests but not fully evaluated."""
+    """
+    Buy or sell items. The player builds a whole order ("health_potion 3,
+    iron_sword") and it is checked and applied in one step.
+    """
+    if current_character is None:
+        return True
+
+    store = get_shop()
+    print(f"\n=== SHOP === (Gold: {current_character['gold']})")
+    for item_type, item_ids in store.by_type.items():
+        print(f"{item_type.title()}:")
+        for item_id in item_ids:
+            print(f"  {item_id:<22} {store.prices[item_id]:>4} gold")
+
+    action = input("Buy or sell? (b/s, blank to leave): ").strip().lower()
+    if action not in ("b", "s"):
+        return True
+    try:
+        order = _parse_order(input("Items (e.g. health_potion 3, iron_sword): "))
+        if action == "b":
+            spent = store.purchase_many(current_character, order)
+            print(f"Spent {spent} gold.")
+        else:
+            received = store.sell_many(current_character, order)
+            print(f"Received {received} gold.")
+    except (InventoryError, ValueError) as e:
+        print(f"Shop error: {e}")
     return True
+
+
+def _parse_order(text):
+    """Turn "health_potion 3, iron_sword" into {item_id: quantity}."""
+    order = {}
+    for entry in text.split(","):
+        parts = entry.split()
+        if not parts:
+            continue
+        quantity = int(parts[1]) if len(parts) > 1 else 1
+        order[parts[0]] = order.get(parts[0], 0) + quantity
+    return order
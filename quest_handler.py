@@ -7,33 +7,109 @@ AI Usage: AI suggested quest accept/complete flow with prerequisites checks.
 """
 
 from custom_exceptions import *
+import character_manager
+from game_data import QuestCatalog, get_quest_by_name
+from quest_log import quest_set
 
-def accept_quest(character, quest):
+def accept_quest(character, quest_id, quests):
     """
-    Accept a quest and add to active_quests.
+    Accept a quest and add its id to active_quests.
+    quests may be a QuestCatalog (quest_id may then also be a title) or
+    the dictionary from load_quests().
     Raises:
+        QuestNotFoundError if quest_id does not exist
         QuestAlreadyAcceptedError
         QuestAlreadyCompletedError
         InsufficientLevelError if character level too low
+        QuestRequirementsNotMetError if the prerequisite is not completed
     """
-    if quest["name"] in character["active_quests"]:
-        raise QuestAlreadyAcceptedError(f"{quest['name']} already active")
-    if quest["name"] in character["completed_quests"]:
-        raise QuestAlreadyCompletedError(f"{quest['name']} already completed")
-    if character["level"] < quest.get("level_required", 1):
+    quest = get_quest_by_name(quest_id, quests)
+    # A QuestCatalog also matches titles; always track the quest by its id
+    quest_id = quest.get("quest_id", quest_id)
+    active = quest_set(character, "active_quests")
+    completed = quest_set(character, "completed_quests")
+    if quest_id in active:
+        raise QuestAlreadyAcceptedError(f"{quest_id} already active")
+    if quest_id in completed:
+        raise QuestAlreadyCompletedError(f"{quest_id} already completed")
+    if character["level"] < quest.get("required_level", 1):
         raise InsufficientLevelError("Level too low for this quest")
+    prerequisite = quest.get("prerequisite", "NONE")
+    if prerequisite != "NONE" and prerequisite not in completed:
+        raise QuestRequirementsNotMetError(f"{quest_id} requires {prerequisite}")
 
-    character["active_quests"].append(quest["name"])
+    active.append(quest_id)
 
-def complete_quest(character, quest):
+def complete_quest(character, quest_id, quests):
     """
-    Complete a quest if in active_quests.
-    Raises QuestNotActiveError if not active.
+    Complete a quest if in active_quests and grant its rewards.
+    Returns the reward summary from complete_quests().
+    Raises:
+        QuestNotFoundError if quest_id does not exist
+        QuestNotActiveError if not active.
+    """
+    return complete_quests(character, [quest_id], quests)
+
+def complete_quests(character, quest_ids, quests):
+    """
+    Complete several active quests at once.
+    Every quest is checked before anything changes, then the combined XP
+    and gold are applied in one step so leveling runs once and the
+    character only needs to be saved once.
+    Returns a summary: {"completed", "xp", "gold", "levels_gained"}.
+    Raises:
+        QuestNotFoundError if a quest id does not exist
+        QuestNotActiveError if a quest is not active or listed twice
+        CharacterDeadError if the character is dead
+    """
+    active = quest_set(character, "active_quests")
+    batch = {}
+    for name in quest_ids:
+        quest = get_quest_by_name(name, quests)
+        quest_id = quest.get("quest_id", name)
+        if quest_id not in active or quest_id in batch:
+            raise QuestNotActiveError(f"{quest_id} is not active")
+        batch[quest_id] = quest
+    if character["health"] <= 0:
+        raise CharacterDeadError("Dead characters cannot complete quests")
+
+    total_xp = sum(quest.get("reward_xp", 0) for quest in batch.values())
+    total_gold = sum(quest.get("reward_gold", 0) for quest in batch.values())
+
+    completed = quest_set(character, "completed_quests")
+    for quest_id in batch:
+        active.remove(quest_id)
+        completed.append(quest_id)
+    levels_gained = character_manager.gain_experience(character, total_xp)
+    character_manager.add_gold(character, total_gold)
+
+    return {
+        "completed": list(batch),
+        "xp": total_xp,
+        "gold": total_gold,
+        "levels_gained": levels_gained,
+    }
+
+def abandon_quest(character, quest_id):
+    """
+    Drop an active quest without completing it.
+    Raises QuestNotActiveError if the quest is not active.
+    """
+    active = quest_set(character, "active_quests")
+    if quest_id not in active:
+        raise QuestNotActiveError(f"{quest_id} is not active")
+    active.remove(quest_id)
+
+def get_active_quests(character, quests):
+    """Return the quest dictionaries for the character's active quests."""
+    return [get_quest_by_name(quest_id, quests) for quest_id in character["active_quests"]]
+
+def get_available_quests(character, quests):
+    """
+    Return the ids of quests the character can accept right now.
+    Pass a QuestCatalog to reuse its compiled prerequisite graph; a plain
+    quest dictionary is compiled on every call.
     """
-    if quest["name"] not in character["active_quests"]:
-        raise QuestNotActiveError(f"{quest['name']} is not active")
-    character["active_quests"].remove(quest["name"])
-    character["completed_quests"].append(quest["name"])
-    # Reward AI-suggested: XP and gold
-    character["experience"] += quest.get("reward_xp", 0)
-    character["gold"] += quest.get("reward_gold", 0)
+    if not isinstance(quests, QuestCatalog):
+        quests = QuestCatalog(quests)
+    return quests.available_quests(character)
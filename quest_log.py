@@ -0,0 +1,122 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Log Module
+
+Name: Darenell Curry
+AI Usage: AI suggested backing the quest lists with an insertion-ordered dict.
+"""
+
+# ----------------------------------------------------------------------------
+# QUEST SET
+# ----------------------------------------------------------------------------
+class QuestSet:
+    """
+    Ordered set of quest ids used for active_quests and completed_quests.
+
+    Keeps the list methods the rest of the game uses (append, remove, in,
+    len, iteration) but stores ids as dict keys, so membership, append and
+    remove are O(1). Iteration order is the order quests were added, which
+    is also the order written to save files.
+
+    After track() the set also logs each add ("+", id) and removal
+    ("-", id) so a save can write just those (see take_changes()).
+    """
+
+    __slots__ = ("_ids", "_log")
+
+    def __init__(self, quest_ids=()):
+        self._ids = dict.fromkeys(quest_ids)
+        self._log = None
+
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __eq__(self, other):
+        if isinstance(other, QuestSet):
+            return list(self._ids) == list(other._ids)
+        if isinstance(other, list):
+            return list(self._ids) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"QuestSet({list(self._ids)!r})"
+
+    def append(self, quest_id):
+        """Add a quest id. Adding an id that is already present does nothing."""
+        if quest_id not in self._ids:
+            self._ids[quest_id] = None
+            if self._log is not None:
+                self._record("+", quest_id)
+
+    def extend(self, quest_ids):
+        for quest_id in quest_ids:
+            self.append(quest_id)
+
+    def remove(self, quest_id):
+        """
+        Remove a quest id.
+        Raises ValueError if it is not present, like list.remove.
+        """
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id} is not in the quest set")
+        if self._log is not None:
+            self._record("-", quest_id)
+
+    def discard(self, quest_id):
+        if quest_id in self._ids:
+            self.remove(quest_id)
+
+    def clear(self):
+        self._ids.clear()
+        # Writing the empty set whole is smaller than one removal per id
+        self._log = None
+
+    def track(self):
+        """Start (or restart) logging changes from the current contents."""
+        self._log = []
+
+    def has_changes(self):
+        """Return True if take_changes() would report anything."""
+        return self._log is None or bool(self._log)
+
+    def take_changes(self):
+        """
+        Return the ("+"|"-", id) changes since track() and keep tracking
+        from here. Returns None when the set should be saved whole instead:
+        it was never tracked, was cleared, or the log grew past the set.
+        """
+        log = self._log
+        self._log = []
+        return log
+
+    def _record(self, op, quest_id):
+        log = self._log
+        log.append((op, quest_id))
+        if len(log) > len(self._ids) + 8:
+            self._log = None
+
+    def to_list(self):
+        """Return the ids as a plain list, the form stored in save files."""
+        return list(self._ids)
+
+# ----------------------------------------------------------------------------
+# HELPERS
+# ----------------------------------------------------------------------------
+def quest_set(character, key):
+    """
+    Return character[key] as a QuestSet, converting a plain list in place
+    the first time so later lookups stay O(1).
+    """
+    quests = character[key]
+    if not isinstance(quests, QuestSet):
+        quests = QuestSet(quests)
+        character[key] = quests
+    return quests
@@ -0,0 +1,350 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Backends Module
+
+Name: Darenell Curry
+AI Usage: AI suggested a single SQLite file in WAL mode with keyset paging.
+
+A save backend stores one save-file dictionary per character name:
+
+    save(name, data)             load(name) -> data
+    save_many([(name, data)])    delete(name)
+    exists(name)                 list_names(after=None, limit=None)
+    append_delta(name, delta)    append_deltas([(name, delta)])
+
+save() writes a full snapshot; append_delta() adds a save_journal delta
+to an existing snapshot (CharacterNotFoundError if there is none), and
+load() returns the snapshot with its journal replayed.
+
+character_manager picks the backend (see set_save_backend()). Existing
+saves/<name>.json directories can be moved into SQLite with:
+
+    python save_backends.py saves saves/characters.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+from custom_exceptions import *
+from save_journal import COMPACT_EVERY, apply_delta
+
+SAVE_SUFFIX = ".json"
+JOURNAL_SUFFIX = ".journal"
+
+# Characters moved per transaction by migrate()
+MIGRATION_BATCH = 500
+
+# ----------------------------------------------------------------------------
+# LEGACY JSON DIRECTORY
+# ----------------------------------------------------------------------------
+class JSONSaveBackend:
+    """
+    One pretty-printed <name>.json file per character (the original
+    layout), plus a <name>.journal file of one delta per line.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.journal_lengths = {}
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + SAVE_SUFFIX)
+
+    def _journal_path(self, name):
+        return os.path.join(self.directory, name + JOURNAL_SUFFIX)
+
+    def save(self, name, data):
+        """
+        Write the save to a temporary file and move it over the old one, so
+        a crash mid-write leaves the previous save intact.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._path(name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        # The snapshot now includes everything the journal held
+        self._remove_journal(name)
+        self.journal_lengths[name] = 0
+
+    def append_delta(self, name, delta):
+        """Append one delta line to the character's journal, fsynced."""
+        if not os.path.exists(self._path(name)):
+            raise CharacterNotFoundError(f"Character '{name}' not found")
+        length = self.journal_lengths.get(name)
+        if length is None:
+            length = len(self._read_journal(name))
+        with open(self._journal_path(name), "a") as f:
+            f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_lengths[name] = length + 1
+        if length + 1 >= COMPACT_EVERY:
+            self.compact(name)
+
+    def append_deltas(self, records):
+        for name, delta in records:
+            self.append_delta(name, delta)
+
+    def compact(self, name):
+        """Rewrite the snapshot with the journal applied and empty the journal."""
+        self.save(name, self.load(name))
+
+    def save_many(self, records):
+        for name, data in records:
+            self.save(name, data)
+
+    def load(self, name):
+        path = self._path(name)
+        if not os.path.exists(path):
+            raise CharacterNotFoundError(f"Character '{name}' not found")
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            raise SaveFileCorruptedError(f"Corrupted save file for {name}")
+        deltas = self._read_journal(name)
+        self.journal_lengths[name] = len(deltas)
+        for delta in deltas:
+            apply_delta(data, delta)
+        return data
+
+    def _read_journal(self, name):
+        """
+        Return the journal's deltas. A torn last line (a crash during an
+        append) was never committed and is ignored.
+        """
+        try:
+            with open(self._journal_path(name)) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        deltas = []
+        for number, line in enumerate(lines, start=1):
+            try:
+                deltas.append(json.loads(line))
+            except ValueError:
+                if number == len(lines) and not line.endswith("\n"):
+                    break
+                raise SaveFileCorruptedError(f"Corrupted journal for {name} at line {number}")
+        return deltas
+
+    def _remove_journal(self, name):
+        try:
+            os.remove(self._journal_path(name))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, name):
+        return os.path.exists(self._path(name))
+
+    def delete(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f"Character '{name}' not found")
+        self._remove_journal(name)
+        self.journal_lengths.pop(name, None)
+
+    def list_names(self, after=None, limit=None):
+        """Return saved names in sorted order, starting after the name given."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(entry[:-len(SAVE_SUFFIX)] for entry in os.listdir(self.directory)
+                       if entry.endswith(SAVE_SUFFIX))
+        if after is not None:
+            names = [name for name in names if name > after]
+        return names if limit is None else names[:limit]
+
+    def close(self):
+        pass
+
+# ----------------------------------------------------------------------------
+# SQLITE
+# ----------------------------------------------------------------------------
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS characters (
+        name TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    ) WITHOUT ROWID
+"""
+_CREATE_JOURNAL = """
+    CREATE TABLE IF NOT EXISTS journal (
+        seq INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        delta TEXT NOT NULL
+    )
+"""
+_CREATE_JOURNAL_INDEX = "CREATE INDEX IF NOT EXISTS journal_by_name ON journal (name, seq)"
+_UPSERT = "INSERT OR REPLACE INTO characters (name, data) VALUES (?, ?)"
+_CLEAR_JOURNAL = "DELETE FROM journal WHERE name = ?"
+_APPEND = ("INSERT INTO journal (name, delta) "
+           "SELECT ?, ? WHERE EXISTS (SELECT 1 FROM characters WHERE name = ?)")
+_SELECT_JOURNAL = "SELECT delta FROM journal WHERE name = ? ORDER BY seq"
+_COUNT_JOURNAL = "SELECT COUNT(*) FROM journal WHERE name = ?"
+_SELECT = "SELECT data FROM characters WHERE name = ?"
+_DELETE = "DELETE FROM characters WHERE name = ?"
+_LIST_FIRST = "SELECT name FROM characters ORDER BY name LIMIT ?"
+_LIST_AFTER = "SELECT name FROM characters WHERE name > ? ORDER BY name LIMIT ?"
+
+class SQLiteSaveBackend:
+    """
+    Every character in one SQLite file, keyed by name.
+
+    The name is the table's primary key, so loads, saves and paged
+    listings are index lookups instead of directory scans. The database
+    runs in WAL mode so readers never wait for a save. Saves are stored as
+    compact JSON, and all SQL is fixed text that sqlite3 prepares once and
+    reuses from its statement cache. A lock lets a background flusher
+    thread share the connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(_CREATE_TABLE)
+        self.connection.execute(_CREATE_JOURNAL)
+        self.connection.execute(_CREATE_JOURNAL_INDEX)
+        self.journal_lengths = {}
+
+    def save(self, name, data):
+        self.save_many([(name, data)])
+
+    def save_many(self, records):
+        """Save (name, data) snapshots, and clear their journals, in one transaction."""
+        encoded = [(name, _encode(data)) for name, data in records]
+        with self.lock, self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(_UPSERT, encoded)
+            self.connection.executemany(_CLEAR_JOURNAL, [(name,) for name, _ in encoded])
+        for name, _ in encoded:
+            self.journal_lengths[name] = 0
+
+    def append_delta(self, name, delta):
+        self.append_deltas([(name, delta)])
+
+    def append_deltas(self, records):
+        """
+        Append (name, delta) pairs to the journal in one transaction, then
+        compact any character whose journal reached COMPACT_EVERY deltas.
+        """
+        rows = [(name, _encode(delta), name) for name, delta in records]
+        with self.lock, self.connection:
+            self.connection.execute("BEGIN")
+            lengths = {}
+            for row in rows:
+                name = row[0]
+                if name not in lengths:
+                    lengths[name] = self.journal_lengths.get(name)
+                    if lengths[name] is None:
+                        (lengths[name],) = self.connection.execute(_COUNT_JOURNAL, (name,)).fetchone()
+                if self.connection.execute(_APPEND, row).rowcount == 0:
+                    raise CharacterNotFoundError(f"Character '{name}' not found")
+                lengths[name] += 1
+        self.journal_lengths.update(lengths)
+        for name, length in lengths.items():
+            if length >= COMPACT_EVERY:
+                self.compact(name)
+
+    def compact(self, name):
+        """Rewrite the snapshot with the journal applied and empty the journal."""
+        self.save(name, self.load(name))
+
+    def load(self, name):
+        with self.lock:
+            row = self.connection.execute(_SELECT, (name,)).fetchone()
+            journal = self.connection.execute(_SELECT_JOURNAL, (name,)).fetchall()
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{name}' not found")
+        try:
+            data = json.loads(row[0])
+            for (delta,) in journal:
+                apply_delta(data, json.loads(delta))
+        except ValueError:
+            raise SaveFileCorruptedError(f"Corrupted save file for {name}")
+        self.journal_lengths[name] = len(journal)
+        return data
+
+    def exists(self, name):
+        with self.lock:
+            return self.connection.execute(_SELECT, (name,)).fetchone() is not None
+
+    def delete(self, name):
+        with self.lock, self.connection:
+            self.connection.execute("BEGIN")
+            deleted = self.connection.execute(_DELETE, (name,)).rowcount
+            self.connection.execute(_CLEAR_JOURNAL, (name,))
+        self.journal_lengths.pop(name, None)
+        if deleted == 0:
+            raise CharacterNotFoundError(f"Character '{name}' not found")
+
+    def list_names(self, after=None, limit=None):
+        """
+        Return saved names in sorted order, starting after the name given.
+        Paging by the last name seen stays fast however deep the page is.
+        """
+        limit = -1 if limit is None else limit
+        with self.lock:
+            if after is None:
+                rows = self.connection.execute(_LIST_FIRST, (limit,)).fetchall()
+            else:
+                rows = self.connection.execute(_LIST_AFTER, (after, limit)).fetchall()
+        return [name for (name,) in rows]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+def _encode(data):
+    return json.dumps(data, separators=(",", ":"))
+
+# ----------------------------------------------------------------------------
+# MIGRATION
+# ----------------------------------------------------------------------------
+def migrate(source, destination, batch_size=MIGRATION_BATCH):
+    """
+    Copy every character from source to destination, batch_size at a time.
+    Returns the number of characters copied.
+    """
+    copied = 0
+    after = None
+    while True:
+        names = source.list_names(after, batch_size)
+        if not names:
+            return copied
+        destination.save_many([(name, source.load(name)) for name in names])
+        copied += len(names)
+        after = names[-1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move JSON character saves into SQLite")
+    parser.add_argument("source", help="directory of <name>.json saves")
+    parser.add_argument("destination", help="SQLite database file to create or update")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH)
+    args = parser.parse_args(argv)
+
+    destination = SQLiteSaveBackend(args.destination)
+    try:
+        copied = migrate(JSONSaveBackend(args.source), destination, args.batch_size)
+    finally:
+        destination.close()
+    print(f"Migrated {copied} characters to {args.destination}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Journal Module
+
+Name: Darenell Curry
+AI Usage: AI suggested journaling per-field deltas and compacting them into snapshots.
+
+A character's save is a full snapshot plus an append-only journal of
+deltas. A delta only holds what changed since the previous save:
+
+    {"set":    {"gold": 150, "level": 3},        fields assigned
+     "unset":  ["equipped_weapon"],              extra fields deleted
+     "quests": {"completed_quests": [["+", "q1"], ["-", "q2"]]},
+     "items":  {"inventory": {"health_potion": 2, "iron_sword": 0}}}
+
+Empty sections are left out. Loading applies every delta to the
+snapshot in order; once a character has COMPACT_EVERY deltas the
+backend writes the result as a new snapshot and empties the journal.
+Applying a journal twice gives the same result as applying it once, so
+a crash between writing a snapshot and clearing its journal is harmless.
+"""
+
+# Deltas a character's journal may hold before it is compacted
+COMPACT_EVERY = 50
+
+# ----------------------------------------------------------------------------
+# DELTAS
+# ----------------------------------------------------------------------------
+def apply_delta(data, delta):
+    """
+    Apply one delta to a save-file dictionary in place and return it.
+    Lists in data are replaced, not edited, so they can safely be shared.
+    """
+    data.update(delta.get("set", ()))
+    for key in delta.get("unset", ()):
+        data.pop(key, None)
+
+    for key, changes in delta.get("quests", {}).items():
+        quest_ids = dict.fromkeys(data.get(key, ()))
+        for op, quest_id in changes:
+            if op == "+":
+                quest_ids.setdefault(quest_id)
+            else:
+                quest_ids.pop(quest_id, None)
+        data[key] = list(quest_ids)
+
+    for key, counts in delta.get("items", {}).items():
+        held = {}
+        for item_id in data.get(key, ()):
+            held[item_id] = held.get(item_id, 0) + 1
+        held.update(counts)
+        data[key] = [item_id for item_id, count in held.items() for _ in range(count)]
+    return data
+
+def replay(snapshot, deltas):
+    """Return snapshot with every delta applied in order."""
+    for delta in deltas:
+        apply_delta(snapshot, delta)
+    return snapshot
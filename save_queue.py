@@ -0,0 +1,254 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Queue Module
+
+Name: Darenell Curry
+AI Usage: AI suggested coalescing pending saves and flushing them from a background thread.
+"""
+
+import atexit
+import json
+import threading
+import time
+
+from custom_exceptions import *
+from save_journal import apply_delta, replay
+
+# Longest a save waits in the queue before the flusher writes it (seconds)
+FLUSH_INTERVAL = 0.5
+
+# Pending characters that trigger an early flush
+MAX_PENDING = 1000
+
+# ----------------------------------------------------------------------------
+# SAVE QUEUE
+# ----------------------------------------------------------------------------
+class SaveQueue:
+    """
+    Write-behind wrapper around a save backend.
+
+    save() only records the latest data for a name and returns; a
+    background thread writes everything pending at least every
+    flush_interval seconds (sooner once max_pending names are waiting) in
+    one save_many() call. Saving the same character several times within
+    a window writes it once, and deltas queued after a full save are
+    folded into it. Reads see pending saves first, so a load right after
+    a save returns the new data. Call flush() (or close()) at
+    shutdown; close() is also registered with atexit.
+
+    Data handed to save() must not be changed afterwards; character_manager
+    passes a fresh dictionary built for each save. Data that cannot be
+    stored is rejected by save() itself, and if the backend still fails a
+    batch, only the names it fails on stay queued.
+    """
+
+    def __init__(self, backend, flush_interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # name -> [snapshot or None, [deltas to append after it]]
+        self.pending = {}
+        self.in_flight = {}
+        self._known = set()
+        self.saves_requested = 0
+        self.saves_written = 0
+        self.error = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="save-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------------
+    # WRITES
+    # ------------------------------------------------------------------------
+    def save(self, name, data):
+        """Queue data as the latest save for name."""
+        if self._closed:
+            raise SaveFileCorruptedError("Save queue is closed")
+        _check_storable(name, data)
+        with self._lock:
+            self.pending[name] = [data, []]
+            self._known.add(name)
+            self.saves_requested += 1
+            full = len(self.pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def save_many(self, records):
+        for name, data in records:
+            self.save(name, data)
+
+    def append_delta(self, name, delta):
+        """
+        Queue a delta for name.
+        Raises CharacterNotFoundError if name has no save to apply it to.
+        """
+        if self._closed:
+            raise SaveFileCorruptedError("Save queue is closed")
+        _check_storable(name, delta)
+        if name not in self._known:
+            if not self.backend.exists(name):
+                raise CharacterNotFoundError(f"Character '{name}' not found")
+            self._known.add(name)
+        with self._lock:
+            entry = self.pending.get(name)
+            if entry is None:
+                self.pending[name] = [None, [delta]]
+            elif entry[0] is not None:
+                apply_delta(entry[0], delta)
+            else:
+                entry[1].append(delta)
+            self.saves_requested += 1
+            full = len(self.pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def append_deltas(self, records):
+        for name, delta in records:
+            self.append_delta(name, delta)
+
+    def delete(self, name):
+        """Drop any pending save for name and delete it from the backend."""
+        with self._write_lock:
+            with self._lock:
+                queued = self.pending.pop(name, None) is not None
+                self._known.discard(name)
+            try:
+                self.backend.delete(name)
+            except CharacterNotFoundError:
+                if not queued:
+                    raise
+
+    def flush(self):
+        """
+        Write every pending save now and return how many names were written.
+        Raises SaveFileCorruptedError if the backend fails; the names it
+        failed on stay queued so a later flush can retry them.
+        """
+        with self._write_lock:
+            with self._lock:
+                batch = self.in_flight = self.pending
+                self.pending = {}
+            if not batch:
+                return 0
+            failed = {}
+            try:
+                self._write(batch.items())
+            except Exception:
+                # Find the names at fault and write everything else
+                for name, entry in batch.items():
+                    try:
+                        self._write([(name, entry)])
+                    except Exception as error:
+                        failed[name] = error
+            with self._lock:
+                # Put failed names back in front of anything queued since
+                for name in failed:
+                    self.pending[name] = _combine(batch[name], self.pending.get(name))
+                self.in_flight = {}
+            written = len(batch) - len(failed)
+            self.saves_written += written
+            if failed:
+                self.error = next(iter(failed.values()))
+                raise SaveFileCorruptedError(
+                    f"Failed to write {len(failed)} saves ({', '.join(failed)}): {self.error}")
+            self.error = None
+            return written
+
+    def _write(self, entries):
+        """Write (name, [snapshot or None, deltas]) queue entries to the backend."""
+        snapshots = []
+        deltas = []
+        for name, (data, entry_deltas) in entries:
+            if data is not None:
+                snapshots.append((name, data))
+            else:
+                deltas.extend((name, delta) for delta in entry_deltas)
+        if snapshots:
+            self.backend.save_many(snapshots)
+        if deltas:
+            self.backend.append_deltas(deltas)
+
+    def close(self):
+        """Stop the flusher thread, write what is left and close the backend."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            self.backend.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except SaveFileCorruptedError:
+                # Kept in self.error and retried on the next pass
+                time.sleep(self.flush_interval)
+
+    # ------------------------------------------------------------------------
+    # READS
+    # ------------------------------------------------------------------------
+    def load(self, name):
+        with self._lock:
+            entry = _combine(self.in_flight.get(name), self.pending.get(name), copy=True)
+        if entry is None:
+            data = self.backend.load(name)
+        else:
+            data, deltas = entry
+            if data is None:
+                # Replaying in-flight deltas the backend may already hold is harmless
+                data = self.backend.load(name)
+            replay(data, deltas)
+        self._known.add(name)
+        return data
+
+    def exists(self, name):
+        with self._lock:
+            if name in self.pending or name in self.in_flight:
+                return True
+        return self.backend.exists(name)
+
+    def list_names(self, after=None, limit=None):
+        with self._lock:
+            queued = [name for name in (*self.pending, *self.in_flight)
+                      if after is None or name > after]
+        names = sorted(set(self.backend.list_names(after, limit)).union(queued))
+        return names if limit is None else names[:limit]
+
+def _check_storable(name, data):
+    """Raise SaveFileCorruptedError now, not at flush time, for data no backend can store."""
+    try:
+        json.dumps(data)
+    except (TypeError, ValueError) as error:
+        raise SaveFileCorruptedError(f"Cannot save {name}: {error}")
+
+def _combine(older, newer, copy=False):
+    """
+    Merge two queue entries for one name, older first. With copy=True the
+    result shares nothing that later queue changes would modify.
+    """
+    if older is None or newer is None:
+        entry = newer if older is None else older
+        if entry is None or not copy:
+            return entry
+        data, deltas = entry
+        return [None if data is None else dict(data), list(deltas)]
+    if newer[0] is not None:
+        return _combine(None, newer, copy)
+    data, deltas = older
+    if copy and data is not None:
+        data = dict(data)
+    if data is not None:
+        replay(data, newer[1])
+        return [data, []]
+    return [None, deltas + newer[1]]
@@ -0,0 +1,119 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Session Cache Module
+
+Name: Darenell Curry
+AI Usage: AI suggested an OrderedDict LRU with a size budget and write-back on eviction.
+"""
+
+import sys
+from collections import OrderedDict
+
+# Defaults for character_manager's cache
+MAX_ENTRIES = 1024
+MEMORY_BUDGET = 64 * 2**20
+
+# Rough bytes per quest id / inventory stack held by a character
+_BYTES_PER_ENTRY = 100
+
+# ----------------------------------------------------------------------------
+# SESSION CACHE
+# ----------------------------------------------------------------------------
+class SessionCache:
+    """
+    Bounded name -> Character cache with least-recently-used eviction.
+
+    Every caller loading a cached name gets the same Character object, so
+    a hot character is read from disk once. The cache holds at most
+    max_entries characters and roughly memory_budget bytes (see
+    estimate_size()). A character evicted with unsaved changes is handed
+    to on_evict (character_manager saves it) before it is dropped; if that
+    fails it stays cached.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, memory_budget=MEMORY_BUDGET, on_evict=None):
+        self.max_entries = max_entries
+        self.memory_budget = memory_budget
+        self.on_evict = on_evict
+        self.entries = OrderedDict()
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def get(self, name):
+        """Return the cached character for name (now most recently used), or None."""
+        entry = self.entries.get(name)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(name)
+        return entry[0]
+
+    def put(self, name, character):
+        """Cache character under name (or refresh its size), then evict to fit."""
+        old = self.entries.pop(name, None)
+        if old is not None:
+            self.memory_used -= old[1]
+        size = estimate_size(character)
+        self.entries[name] = (character, size)
+        self.memory_used += size
+        self._evict()
+
+    def discard(self, name):
+        entry = self.entries.pop(name, None)
+        if entry is not None:
+            self.memory_used -= entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.memory_used = 0
+
+    def dirty(self):
+        """Return the names of cached characters with unsaved changes."""
+        return [name for name, (character, _) in self.entries.items() if _has_changes(character)]
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "memory_used": self.memory_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self):
+        # Never evict the entry just added
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries
+                                         or self.memory_used > self.memory_budget):
+            name, (character, size) = next(iter(self.entries.items()))
+            if self.on_evict is not None and _has_changes(character):
+                try:
+                    self.on_evict(character)
+                except Exception:
+                    self.entries.move_to_end(name)
+                    return
+            del self.entries[name]
+            self.memory_used -= size
+            self.evictions += 1
+
+def _has_changes(character):
+    has_changes = getattr(character, "has_changes", None)
+    return has_changes is not None and has_changes()
+
+def estimate_size(character):
+    """Approximate bytes held by a character and the values it owns."""
+    size = sys.getsizeof(character)
+    for value in character.values():
+        if isinstance(value, (int, str)):
+            size += sys.getsizeof(value)
+        else:
+            size += sys.getsizeof(value) + _BYTES_PER_ENTRY * len(value)
+    return size
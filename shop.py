@@ -0,0 +1,87 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Shop Module
+
+Name: Darenell Curry
+AI Usage: AI suggested building price and type indexes once per catalog.
+"""
+
+from bisect import bisect_right
+
+import game_data
+import inventory_system
+from custom_exceptions import *
+
+# ----------------------------------------------------------------------------
+# SHOP
+# ----------------------------------------------------------------------------
+class Shop:
+    """
+    Item catalog indexed for buying and selling.
+
+    Built once from item_id -> item records: prices maps each item to its
+    COST, by_type lists each TYPE's items cheapest first, and a sorted
+    cost list answers "what can I afford" with one bisect. Orders of
+    several items are checked and applied in one step by
+    inventory_system.purchase_many() and sell_many().
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.prices = {item_id: item["cost"] for item_id, item in items.items()}
+
+        by_cost = sorted(self.prices, key=lambda item_id: (self.prices[item_id], item_id))
+        self._sorted_ids = by_cost
+        self._sorted_costs = [self.prices[item_id] for item_id in by_cost]
+
+        self.by_type = {}
+        for item_id in by_cost:
+            self.by_type.setdefault(items[item_id]["type"], []).append(item_id)
+
+    def price(self, item_id):
+        """Return the COST of an item. Raises ItemNotFoundError if it is not sold."""
+        try:
+            return self.prices[item_id]
+        except KeyError:
+            raise ItemNotFoundError(f"{item_id} is not for sale")
+
+    def sell_price(self, item_id):
+        """Return the gold paid for selling one of an item (half its cost)."""
+        return self.price(item_id) // 2
+
+    def items_of_type(self, item_type):
+        """Return the item ids of one TYPE, cheapest first."""
+        return list(self.by_type.get(item_type, ()))
+
+    def affordable(self, gold):
+        """Return the item ids costing at most gold, cheapest first."""
+        return self._sorted_ids[:bisect_right(self._sorted_costs, gold)]
+
+    def order_cost(self, order):
+        """Return the total cost of an item_id -> quantity order."""
+        return sum(self.price(item_id) * quantity for item_id, quantity in order.items())
+
+    def purchase_many(self, character, order):
+        """Buy every item in order or none of them. Returns the gold spent."""
+        return inventory_system.purchase_many(character, order, self.prices)
+
+    def sell_many(self, character, order):
+        """Sell every item in order or none of them. Returns the gold received."""
+        return inventory_system.sell_many(character, order, self.prices)
+
+_shop = None
+
+def get_shop():
+    """Return the Shop for game_data.ITEMS, building it on first use."""
+    global _shop
+    if _shop is None:
+        _shop = Shop(game_data.ITEMS)
+    return _shop
+
+def purchase_many(character, order):
+    """Buy an item_id -> quantity order from the game's shop."""
+    return get_shop().purchase_many(character, order)
+
+def sell_many(character, order):
+    """Sell an item_id -> quantity order to the game's shop."""
+    return get_shop().sell_many(character, order)
@@ -0,0 +1,161 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Balance Simulator Module
+
+Name: Darenell Curry
+AI Usage: AI suggested splitting the sweep into seeded chunks for a process pool.
+
+Runs many SimpleBattles for every class x enemy x level combination and
+reports win rate, rounds-to-finish and health-left distributions.
+
+    python simulator.py --battles 100000 --levels 1-10 --workers 8
+"""
+
+import argparse
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import combat_system
+from combat_rng import CombatRNG
+from custom_exceptions import *
+
+CHARACTER_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# Battles per unit of work sent to a worker process
+DEFAULT_CHUNK_SIZE = 5000
+
+# ----------------------------------------------------------------------------
+# SIMULATION
+# ----------------------------------------------------------------------------
+def simulate(battles=1000, levels=range(1, 11), classes=CHARACTER_CLASSES,
+             enemies=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=0):
+    """
+    Run battles fights for every class x enemy x level combination.
+    Work is split into chunks of at most chunk_size battles, each with its
+    own seed derived from seed, so the same arguments always give the same
+    results no matter how many workers run them. workers=1 runs in this
+    process; None uses one worker per CPU.
+    Returns {(class, enemy, level): summary}, see _summarize().
+    """
+    if enemies is None:
+        enemies = combat_system.get_enemy_registry().enemy_ids
+    tasks = []
+    for char_class in classes:
+        for enemy_type in enemies:
+            for level in levels:
+                for chunk, start in enumerate(range(0, battles, chunk_size)):
+                    count = min(chunk_size, battles - start)
+                    chunk_seed = f"{seed}/{char_class}/{enemy_type}/{level}/{chunk}"
+                    tasks.append((char_class, enemy_type, level, count, chunk_seed))
+
+    if workers == 1:
+        chunk_results = map(run_chunk, tasks)
+        return _merge(tasks, chunk_results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge(tasks, pool.map(run_chunk, tasks))
+
+def run_chunk(task):
+    """
+    Worker: fight count battles for one matchup.
+    Returns raw tallies: wins, losses, stalemates and Counters of rounds
+    and of health left (in 10% buckets of max health).
+    """
+    char_class, enemy_type, level, count, chunk_seed = task
+    template = _character_at_level(char_class, level)
+    rng = CombatRNG(chunk_seed)
+
+    tally = {"wins": 0, "losses": 0, "stalemates": 0,
+             "rounds": Counter(), "health_left": Counter()}
+    for _ in range(count):
+        character = dict(template)
+        enemy = combat_system.create_enemy(enemy_type, level)
+        battle = combat_system.SimpleBattle(character, enemy, rng.next_uint32())
+        try:
+            result = battle.start_battle()
+        except CombatStalemateError:
+            tally["stalemates"] += 1
+            continue
+        if result["winner"] == combat_system.PLAYER:
+            tally["wins"] += 1
+            tally["health_left"][10 * (10 * character["health"] // character["max_health"])] += 1
+        else:
+            tally["losses"] += 1
+        tally["rounds"][result["rounds"]] += 1
+    return tally
+
+def _character_at_level(char_class, level):
+    """Return a plain-dict character of char_class at the start of level."""
+    character = character_manager.create_character(f"Sim{char_class}", char_class)
+    character_manager.gain_experience(character, character_manager.LEVEL_CURVE.total_xp(level, 0))
+    return {key: character[key] for key in ("name", "health", "max_health", "attack", "defense")}
+
+def _merge(tasks, chunk_results):
+    """Combine chunk tallies into one summary per matchup."""
+    merged = {}
+    for (char_class, enemy_type, level, _, _), tally in zip(tasks, chunk_results):
+        key = (char_class, enemy_type, level)
+        total = merged.setdefault(key, {"wins": 0, "losses": 0, "stalemates": 0,
+                                        "rounds": Counter(), "health_left": Counter()})
+        for field in ("wins", "losses", "stalemates"):
+            total[field] += tally[field]
+        total["rounds"].update(tally["rounds"])
+        total["health_left"].update(tally["health_left"])
+    return {key: _summarize(total) for key, total in merged.items()}
+
+def _summarize(total):
+    """
+    Build the per-matchup summary:
+        battles, wins, losses, stalemates, win_rate, mean_rounds,
+        rounds (rounds -> count), health_left (percent bucket -> wins)
+    """
+    battles = total["wins"] + total["losses"] + total["stalemates"]
+    decided = total["wins"] + total["losses"]
+    mean_rounds = (sum(rounds * count for rounds, count in total["rounds"].items()) / decided
+                   if decided else 0.0)
+    return {
+        "battles": battles,
+        "wins": total["wins"],
+        "losses": total["losses"],
+        "stalemates": total["stalemates"],
+        "win_rate": total["wins"] / battles if battles else 0.0,
+        "mean_rounds": mean_rounds,
+        "rounds": dict(sorted(total["rounds"].items())),
+        "health_left": dict(sorted(total["health_left"].items())),
+    }
+
+# ----------------------------------------------------------------------------
+# COMMAND LINE
+# ----------------------------------------------------------------------------
+def _parse_levels(text):
+    """Parse "5" or "1-10" into a range of levels."""
+    low, _, high = text.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quest Chronicles balance simulator")
+    parser.add_argument("--battles", type=int, default=1000, help="battles per matchup")
+    parser.add_argument("--levels", type=_parse_levels, default=range(1, 11), help="e.g. 1-10")
+    parser.add_argument("--classes", nargs="+", default=CHARACTER_CLASSES)
+    parser.add_argument("--enemies", nargs="+", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print full results as JSON")
+    args = parser.parse_args(argv)
+
+    results = simulate(args.battles, args.levels, args.classes, args.enemies,
+                       args.workers, args.chunk_size, args.seed)
+
+    if args.json:
+        print(json.dumps([{"class": c, "enemy": e, "level": l, **summary}
+                          for (c, e, l), summary in results.items()], indent=2))
+        return
+    print(f"{'class':<8} {'enemy':<8} {'lvl':>3} {'win%':>6} {'rounds':>7} {'stalemate':>9}")
+    for (char_class, enemy_type, level), summary in results.items():
+        print(f"{char_class:<8} {enemy_type:<8} {level:>3} {100 * summary['win_rate']:>6.1f} "
+              f"{summary['mean_rounds']:>7.1f} {summary['stalemates']:>9}")
+
+if __name__ == "__main__":
+    main()
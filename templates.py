@@ -0,0 +1,83 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Shared Templates Module
+
+Name: Darenell Curry
+AI Usage: AI suggested copy-on-write instances over read-only templates.
+"""
+
+from collections.abc import MutableMapping
+from copy import deepcopy
+from types import MappingProxyType
+
+# ----------------------------------------------------------------------------
+# TEMPLATES
+# ----------------------------------------------------------------------------
+def freeze(record):
+    """Return a read-only copy of a record, safe to share between instances."""
+    if isinstance(record, MappingProxyType):
+        return record
+    return MappingProxyType(dict(record))
+
+class Instance(MutableMapping):
+    """
+    A spawned enemy or item that shares a read-only template.
+
+    Reads fall through to the template; writes (current health,
+    durability, ...) go into a small per-instance dict that only holds the
+    fields that actually changed. Creating an instance copies nothing.
+    """
+
+    __slots__ = ("template", "changes")
+
+    def __init__(self, template, changes=None):
+        self.template = freeze(template)
+        self.changes = changes
+
+    def __getitem__(self, key):
+        changes = self.changes
+        if changes is not None and key in changes:
+            return changes[key]
+        return self.template[key]
+
+    def __setitem__(self, key, value):
+        if self.changes is None:
+            self.changes = {}
+        self.changes[key] = value
+
+    def __delitem__(self, key):
+        if key in self.template:
+            raise TypeError(f"Cannot delete template field '{key}'")
+        if self.changes is None or key not in self.changes:
+            raise KeyError(key)
+        del self.changes[key]
+
+    def __contains__(self, key):
+        return key in self.template or (self.changes is not None and key in self.changes)
+
+    def __iter__(self):
+        yield from self.template
+        if self.changes:
+            yield from [key for key in self.changes if key not in self.template]
+
+    def __len__(self):
+        if not self.changes:
+            return len(self.template)
+        return len(self.template) + sum(1 for key in self.changes if key not in self.template)
+
+    def __copy__(self):
+        return Instance(self.template, dict(self.changes) if self.changes else None)
+
+    def __deepcopy__(self, memo):
+        return Instance(self.template, deepcopy(self.changes, memo))
+
+    def __reduce__(self):
+        # mappingproxy cannot be pickled; send a plain copy of the template
+        return (Instance, (dict(self.template), self.changes))
+
+    def __repr__(self):
+        return f"Instance({self.template.get('name')!r}, changes={self.changes!r})"
+
+    def to_dict(self):
+        """Return a plain dictionary of the current values."""
+        return dict(self)
@@ -0,0 +1,139 @@
+"""
+Test Character Model
+Tests the slotted Character record, its dictionary-style interface and
+the column-based CharacterStore
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import inventory_system
+from character_model import Character
+from character_store import CharacterStore
+from derived_stats import add_buff, effective_stats
+
+def test_character_has_no_instance_dict():
+    """Characters should use slots, not a per-instance __dict__"""
+    char = character_manager.create_character("Slots", "Mage")
+
+    assert isinstance(char, Character)
+    assert not hasattr(char, "__dict__")
+
+def test_character_mapping_interface():
+    """Old dictionary-style code should keep working"""
+    char = character_manager.create_character("Mapping", "Cleric")
+
+    char['health'] -= 30
+    char['equipped_weapon'] = "iron_sword"
+
+    assert char['health'] == 70
+    assert char.health == 70
+    assert 'equipped_weapon' in char
+    assert char.get('missing', 'default') == 'default'
+    with pytest.raises(KeyError):
+        char['missing']
+
+def test_character_round_trips_through_dict():
+    """to_dict/from_dict should preserve every field, including extras"""
+    char = character_manager.create_character("RoundTrip", "Rogue")
+    char['completed_quests'].append('first_steps')
+    char['equipped_armor'] = "leather_armor"
+
+    data = char.to_dict()
+    copy = Character.from_dict(data)
+
+    assert data['completed_quests'] == ['first_steps']
+    assert copy == char
+    assert copy['equipped_armor'] == "leather_armor"
+
+# ============================================================================
+# CHARACTER STORE TESTS
+# ============================================================================
+
+def make_store():
+    chars = [character_manager.create_character(f"Row{i}", "Warrior") for i in range(3)]
+    chars[0]['health'] = 40
+    chars[2]['health'] = 0  # dead
+    return CharacterStore(chars)
+
+def test_store_bulk_operations_skip_dead():
+    """Bulk heal, gold and XP should only affect living characters"""
+    store = make_store()
+
+    store.heal_all(25)
+    store.add_gold_all(10)
+    levels = store.grant_xp_all(250)
+
+    assert list(store.columns['health']) == [120, 120, 0]
+    start = character_manager.STARTING_GOLD
+    assert list(store.columns['gold']) == [start + 10, start + 10, start]
+    assert list(store.columns['level']) == [3, 3, 1]
+    assert list(store.columns['experience']) == [50, 50, 0]
+    assert levels == 4
+
+def test_store_rows_work_with_existing_functions():
+    """Row views should behave like character dictionaries"""
+    store = make_store()
+    row = store.row(1)
+
+    character_manager.gain_experience(row, 100)
+    combat_system.attack(row, store.row(0))
+
+    assert store.columns['level'][1] == 2
+    assert store.row(0)['health'] == 40 - (row['attack'] - store.row(0)['defense'])
+    assert row['name'] == "Row1"
+
+def test_store_rows_do_not_share_containers():
+    """Changing a row's quests or items must not change the source character"""
+    char = character_manager.create_character("Source", "Rogue")
+    char['inventory'].add('health_potion', 2)
+    char.mark_saved()
+    store = CharacterStore([char])
+
+    inventory_system.add_item_to_inventory(store.row(0), 'health_potion')
+    store.row(0)['active_quests'].append('first_steps')
+
+    assert store.row(0)['inventory'] == ['health_potion'] * 3
+    assert char['inventory'] == ['health_potion'] * 2
+    assert char['active_quests'] == []
+    assert not char.has_changes()
+
+# ============================================================================
+# DERIVED STAT TESTS
+# ============================================================================
+
+def test_derived_stats_cached_until_inputs_change():
+    """Effective stats are reused until equipment, level or buffs change"""
+    char = character_manager.create_character("Derived", "Warrior")
+    stats = effective_stats(char)
+    assert stats == (5, 2)
+    assert effective_stats(char) is stats
+
+    char['health'] -= 10  # not an input, cache kept
+    assert effective_stats(char) is stats
+
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+    inventory_system.equip_weapon(char, 'iron_sword', {'type': 'weapon', 'effect': 'strength:5'})
+    add_buff(char, 'defense', 3)
+    assert effective_stats(char) == (10, 5)
+
+    character_manager.gain_experience(char, character_manager.XP_PER_LEVEL)
+    assert effective_stats(char) == (12, 6)
+
+def test_attack_uses_effective_stats():
+    """Strength and buffs feed into combat damage"""
+    char = character_manager.create_character("Striker", "Rogue")
+    char['strength'] = 4
+    enemy = {'name': 'Dummy', 'health': 50, 'attack': 1, 'defense': 3}
+
+    assert combat_system.attack(char, enemy) == 6
+    add_buff(enemy, 'defense', 2)
+    assert combat_system.attack(char, enemy) == 4
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
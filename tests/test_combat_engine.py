@@ -0,0 +1,263 @@
+"""
+Test Combat Engine
+Tests closed-form battle resolution and the combat helpers built on it
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+import simulator
+from character_store import CharacterStore
+from combat_clock import CombatClock, WHEEL_SLOTS
+from combat_rng import CombatRNG, BLOCK_SIZE
+
+def fighter(name, health, attack, defense):
+    return {'name': name, 'health': health, 'max_health': health,
+            'attack': attack, 'defense': defense}
+
+# ============================================================================
+# BATCH COMBAT TESTS
+# ============================================================================
+
+def test_battle_many_matches_turn_by_turn_battle():
+    """Closed-form results should match the simulated battle loop"""
+    attackers = [fighter("A", 30, 7, 1), fighter("A", 10, 3, 0), fighter("A", 50, 9, 4)]
+    defenders = [fighter("D", 25, 4, 2), fighter("D", 40, 6, 1), fighter("D", 50, 9, 4)]
+
+    results = combat_system.battle_many(attackers, defenders)
+
+    for index, (attacker, defender) in enumerate(zip(attackers, defenders)):
+        winner = combat_system.simulate_battle(dict(attacker), dict(defender))
+        expected = (combat_system.ATTACKER_WINS if winner['name'] == "A"
+                    else combat_system.DEFENDER_WINS)
+        assert results['winners'][index] == expected
+    assert list(results['defender_health']) == [0, 40 - 2 * 2, 0]
+
+def test_battle_many_reports_stalemates_and_reads_stores():
+    """Fights where nobody can deal damage should be stalemates"""
+    heroes = CharacterStore([character_manager.create_character("Tank", "Warrior")])
+    walls = [fighter("Wall", 100, 0, 50)]
+
+    results = combat_system.battle_many(heroes, walls)
+
+    assert results['winners'][0] == combat_system.STALEMATE
+    assert results['attacker_health'][0] == 100
+
+def test_battle_many_store_uses_effective_stats():
+    """A store and its rows should give the same winner when strength counts"""
+    hero = character_manager.create_character("Hero", "Warrior")
+    hero['strength'] = 10
+    heroes = CharacterStore([hero])
+    walls = [fighter("Wall", 100, 6, 6)]
+
+    from_store = combat_system.battle_many(heroes, walls)
+    from_rows = combat_system.battle_many(list(heroes), walls)
+    assert from_store['winners'][0] == combat_system.ATTACKER_WINS
+    assert list(from_store['winners']) == list(from_rows['winners'])
+    assert list(from_store['rounds']) == list(from_rows['rounds'])
+
+# ============================================================================
+# BATTLE PREDICTION TESTS
+# ============================================================================
+
+def test_predict_battle_does_not_change_fighters():
+    """Prediction should report the outcome without touching health"""
+    hero = fighter("Hero", 30, 7, 1)
+    goblin = fighter("Goblin", 25, 4, 2)
+
+    outcome = combat_system.predict_battle(hero, goblin)
+
+    assert outcome['winner'] is hero
+    assert outcome['rounds'] == 5
+    assert outcome['attacker_health'] == 30 - 4 * 3
+    assert hero['health'] == 30 and goblin['health'] == 25
+
+def test_battle_applies_predicted_health():
+    """battle() should leave both sides where the simulation would"""
+    hero, goblin = fighter("Hero", 30, 7, 1), fighter("Goblin", 25, 4, 2)
+    hero_sim, goblin_sim = dict(hero), dict(goblin)
+
+    winner = combat_system.battle(hero, goblin)
+    combat_system.simulate_battle(hero_sim, goblin_sim)
+
+    assert winner is hero
+    assert (hero['health'], goblin['health']) == (hero_sim['health'], goblin_sim['health'])
+
+def test_battle_stalemate_raises_instead_of_hanging():
+    """Zero damage on both sides should raise, not loop forever"""
+    hero, wall = fighter("Hero", 30, 2, 10), fighter("Wall", 30, 1, 10)
+
+    assert combat_system.predict_battle(hero, wall)['stalemate'] is True
+    with pytest.raises(CombatStalemateError):
+        combat_system.battle(hero, wall)
+
+# ============================================================================
+# ABILITY TESTS
+# ============================================================================
+
+def test_ability_registry_lookups():
+    """Abilities should resolve by id number, ability_id and name"""
+    registry = combat_system.get_ability_registry()
+    strike = registry.get("power_strike")
+
+    assert registry.get("Power Strike") is strike
+    assert registry.get(strike.id) is strike
+    with pytest.raises(InvalidTargetError):
+        registry.get("Meteor")
+
+def test_use_ability_damage_and_heal():
+    """Damage abilities hurt the defender, healing ones help the user"""
+    hero, goblin = fighter("Hero", 100, 5, 2), fighter("Goblin", 50, 3, 1)
+    hero['health'] = 80
+
+    assert combat_system.use_ability(hero, goblin, "Fireball") == 20
+    assert combat_system.use_ability(hero, goblin, "heal") == -15
+    assert goblin['health'] == 30
+    assert hero['health'] == 95
+
+# ============================================================================
+# COMBAT CLOCK TESTS
+# ============================================================================
+
+def test_clock_effects_expire_on_time():
+    """Effects should stack and drop off on their expiry tick, even far out"""
+    clock = CombatClock()
+    clock.add_effect("player", "attack", 5, 2)
+    clock.add_effect("player", "attack", 3, WHEEL_SLOTS + 4)
+
+    assert clock.modifier("player", "attack") == 8
+    clock.advance()
+    clock.advance()
+    assert clock.modifier("player", "attack") == 3
+    for _ in range(WHEEL_SLOTS + 2):
+        clock.advance()
+    assert clock.modifier("player", "attack") == 0
+
+def test_battle_ability_cooldown_and_burn():
+    """Abilities should go on cooldown and damage over time should tick"""
+    hero, goblin = fighter("Hero", 100, 5, 2), fighter("Goblin", 100, 3, 1)
+    battle = combat_system.SimpleBattle(hero, goblin)
+
+    battle.player_turn("fireball")
+    battle.enemy_turn()
+    with pytest.raises(AbilityOnCooldownError):
+        battle.player_turn("fireball")
+
+    # 20 from the hit plus one round of burn
+    assert goblin['health'] == 100 - 20 - 3
+
+def test_battle_stalemate_raised_after_burn_wears_off():
+    """A stalemate hidden by damage over time should raise once it ends"""
+    hero, wall = fighter("Hero", 100, 1, 10), fighter("Wall", 100, 1, 10)
+    battle = combat_system.SimpleBattle(hero, wall, seed=1)
+    battle.player_turn("fireball")
+    battle.enemy_turn()
+
+    with pytest.raises(CombatStalemateError):
+        battle.start_battle()
+    assert hero['health'] > 0 and wall['health'] > 0
+
+def test_battle_runs_to_a_winner():
+    """start_battle should finish with a winner and stop accepting turns"""
+    battle = combat_system.SimpleBattle(fighter("Hero", 30, 7, 1), fighter("Goblin", 25, 4, 2))
+
+    result = battle.start_battle()
+
+    assert result['winner'] == 'player'
+    assert result['rounds'] <= 5
+    with pytest.raises(CombatNotActiveError):
+        battle.enemy_turn()
+
+# ============================================================================
+# RNG AND REPLAY TESTS
+# ============================================================================
+
+def test_rng_stream_depends_only_on_seed():
+    """Same seed, same numbers, across block refills"""
+    first, second = CombatRNG(42), CombatRNG(42)
+
+    rolls = [first.randint(1, 6) for _ in range(BLOCK_SIZE * 3)]
+
+    assert rolls == [second.randint(1, 6) for _ in range(BLOCK_SIZE * 3)]
+    assert set(rolls) == {1, 2, 3, 4, 5, 6}
+
+def test_battle_replay_is_identical():
+    """Replaying from seed and actions should reproduce the battle"""
+    hero, goblin = fighter("Hero", 60, 6, 1), fighter("Goblin", 60, 5, 1)
+    battle = combat_system.SimpleBattle(dict(hero), dict(goblin), seed=7)
+    battle.player_turn("fireball")
+    while battle.combat_active:
+        battle.enemy_turn()
+        if battle.combat_active:
+            battle.player_turn()
+
+    replay = combat_system.replay_battle(dict(hero), dict(goblin), battle.seed, battle.actions)
+
+    assert replay.winner == battle.winner
+    assert replay.rounds == battle.rounds
+    assert replay.character == battle.character
+    assert replay.enemy == battle.enemy
+
+# ============================================================================
+# ENEMY REGISTRY TESTS
+# ============================================================================
+
+def test_enemy_stats_scale_with_level():
+    """Prebuilt stat blocks should scale and clamp to the enemy's range"""
+    base = combat_system.create_enemy("orc")
+    scaled = combat_system.create_enemy("orc", 5)
+
+    assert base['level'] == 3
+    assert scaled['health'] == base['health'] + 2 * 10
+    assert combat_system.create_enemy("goblin", 50)['level'] == 5
+    assert combat_system.create_enemy("Goblin") is not combat_system.create_enemy("goblin")
+
+def test_spawned_enemies_share_their_template():
+    """Enemies should only store the fields changed during play"""
+    first = combat_system.create_enemy("orc", 4)
+    second = combat_system.create_enemy("orc", 4)
+
+    first['health'] -= 10
+
+    assert first.template is second.template
+    assert first.changes == {'health': first['max_health'] - 10}
+    assert second['health'] == second['max_health']
+    with pytest.raises(TypeError):
+        first.template['attack'] = 99
+
+def test_enemy_picks_follow_weights():
+    """Alias-table picks should match the configured spawn weights"""
+    registry = combat_system.get_enemy_registry()
+    rng = CombatRNG(11)
+
+    picks = [registry.pick(1, rng) for _ in range(16000)]
+
+    # Level 1: goblin weight 10, wolf weight 6
+    assert set(picks) == {"goblin", "wolf"}
+    assert abs(picks.count("goblin") / len(picks) - 10 / 16) < 0.02
+
+# ============================================================================
+# SIMULATOR TESTS
+# ============================================================================
+
+def test_simulator_results_do_not_depend_on_workers():
+    """Seeded chunks should give the same totals in-process and in a pool"""
+    options = dict(battles=60, levels=[1, 2], classes=["Warrior"],
+                   enemies=["goblin", "orc"], chunk_size=25, seed=3)
+
+    local = simulator.simulate(workers=1, **options)
+    pooled = simulator.simulate(workers=2, **options)
+
+    assert local == pooled
+    summary = local[("Warrior", "goblin", 1)]
+    assert summary['battles'] == 60
+    assert summary['win_rate'] == 1.0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
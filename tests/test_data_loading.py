@@ -0,0 +1,117 @@
+"""
+Test Data Loading
+Tests the block parser and the compiled data cache
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_BLOCK = """QUEST_ID: {quest_id}
+TITLE: Test Quest
+DESCRIPTION: A test
+REWARD_XP: {xp}
+REWARD_GOLD: 10
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+def write_quests(path, *blocks):
+    path.write_text("\n".join(blocks))
+
+def test_cache_is_written_and_reused(tmp_path, monkeypatch):
+    """Second load should come from the cache without parsing text"""
+    quest_file = tmp_path / "quests.txt"
+    write_quests(quest_file, QUEST_BLOCK.format(quest_id="a", xp=5))
+
+    first = game_data.load_quests(str(quest_file))
+    assert os.path.exists(str(quest_file) + game_data.CACHE_SUFFIX)
+
+    def fail_parse(*args):
+        raise AssertionError("text parser should not run on a cache hit")
+    monkeypatch.setattr(game_data, "_parse_blocks", fail_parse)
+
+    assert game_data.load_quests(str(quest_file)) == first
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    """Editing the data file should rebuild the cache"""
+    quest_file = tmp_path / "quests.txt"
+    write_quests(quest_file, QUEST_BLOCK.format(quest_id="a", xp=5))
+    game_data.load_quests(str(quest_file))
+
+    write_quests(quest_file,
+                 QUEST_BLOCK.format(quest_id="a", xp=5),
+                 QUEST_BLOCK.format(quest_id="b", xp=500))
+    quests = game_data.load_quests(str(quest_file))
+
+    assert quests["b"]["reward_xp"] == 500
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """A garbage cache file should fall back to parsing"""
+    quest_file = tmp_path / "quests.txt"
+    write_quests(quest_file, QUEST_BLOCK.format(quest_id="a", xp=5))
+    game_data.load_quests(str(quest_file))
+
+    with open(str(quest_file) + game_data.CACHE_SUFFIX, "wb") as f:
+        f.write(b"not a cache")
+
+    assert game_data.load_quests(str(quest_file))["a"]["reward_xp"] == 5
+
+def test_non_numeric_field_rejected(tmp_path):
+    """Numeric fields that are not numbers should fail validation"""
+    quest_file = tmp_path / "quests.txt"
+    write_quests(quest_file, QUEST_BLOCK.format(quest_id="a", xp="lots"))
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(str(quest_file))
+
+# ============================================================================
+# QUEST CATALOG TESTS
+# ============================================================================
+
+def test_quest_catalog_lookups():
+    """Catalog should find quests by id, title, level and prerequisite"""
+    catalog = game_data.QuestCatalog(game_data.load_quests("data/quests.txt"))
+
+    assert catalog["orc_menace"] is catalog.find("The Orc Menace")
+    assert set(catalog.unlocked_by("first_steps")) == {"goblin_hunter", "equipment_upgrade"}
+    assert set(catalog.quests_up_to_level(2)) == {"first_steps", "goblin_hunter", "equipment_upgrade"}
+
+    with pytest.raises(QuestNotFoundError):
+        catalog.find("no_such_quest")
+
+def test_quest_catalog_is_read_only():
+    """Catalog and its quest records should not be modifiable"""
+    catalog = game_data.QuestCatalog(game_data.load_quests("data/quests.txt"))
+
+    with pytest.raises(TypeError):
+        catalog["first_steps"]["reward_xp"] = 9999
+    with pytest.raises(AttributeError):
+        catalog.extra = True
+
+def test_quest_catalog_available_quests():
+    """Availability should follow the prerequisite chain and level"""
+    catalog = game_data.QuestCatalog(game_data.load_quests("data/quests.txt"))
+    char = {'level': 10, 'active_quests': ['equipment_upgrade'],
+            'completed_quests': ['first_steps', 'goblin_hunter']}
+
+    assert catalog.available_quests(char) == ['orc_menace']
+    assert catalog.requirements('dragon_slayer') == ['first_steps', 'goblin_hunter', 'orc_menace']
+
+def test_quest_catalog_rejects_cycles():
+    """A prerequisite cycle should be reported as bad data"""
+    quests = {
+        'a': {'quest_id': 'a', 'prerequisite': 'b'},
+        'b': {'quest_id': 'b', 'prerequisite': 'a'},
+    }
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.QuestCatalog(quests)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
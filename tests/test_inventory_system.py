@@ -0,0 +1,167 @@
+"""
+Test Inventory System
+Tests item stacks, slot accounting and save-file compatibility
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+from inventory_stacks import Inventory
+from item_effects import compile_effect
+from shop import Shop, get_shop
+
+# ============================================================================
+# INVENTORY STACK TESTS
+# ============================================================================
+
+def test_potions_share_a_slot():
+    """Stackable items should only use a new slot per MAX_STACK items"""
+    inventory = Inventory()
+    inventory.add('health_potion', 10)
+    assert inventory.slots_used == 1
+    inventory.add('health_potion')
+    assert inventory.slots_used == 2
+    inventory.add('iron_sword', 2)
+    assert inventory.slots_used == 4
+
+    inventory.remove('health_potion', 2)
+    assert inventory.count('health_potion') == 9
+    assert inventory.slots_used == 3
+    with pytest.raises(ItemNotFoundError):
+        inventory.remove('iron_sword', 3)
+
+def test_capacity_counts_slots_not_items():
+    """MAX_INVENTORY limits slots, so many potions fit"""
+    char = {'inventory': []}
+    inventory_system.add_item_to_inventory(char, 'health_potion', 10 * inventory_system.MAX_INVENTORY)
+    assert len(char['inventory']) == 10 * inventory_system.MAX_INVENTORY
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, 'health_potion')
+    assert char['inventory'].count('health_potion') == 10 * inventory_system.MAX_INVENTORY
+
+def test_inventory_rejects_bad_quantities():
+    """Zero or negative quantities should not create or hide items"""
+    inventory = Inventory()
+    for bad in (0, -3):
+        with pytest.raises(ValueError):
+            inventory.remove('health_potion', bad)
+        with pytest.raises(ValueError):
+            inventory.add('health_potion', bad)
+    assert 'health_potion' not in inventory
+    assert inventory.count('health_potion') == 0
+
+def test_inventory_saves_as_plain_list(tmp_path, monkeypatch):
+    """Save files should keep holding a plain list of item ids"""
+    monkeypatch.setattr(character_manager, 'SAVE_DIR', str(tmp_path))
+    char = character_manager.create_character("Stacker", "Rogue")
+    inventory_system.add_item_to_inventory(char, 'health_potion', 3)
+    character_manager.save_character(char)
+    character_manager.get_session_cache().clear()
+
+    loaded = character_manager.load_character("Stacker")
+    assert isinstance(loaded['inventory'], Inventory)
+    assert loaded['inventory'] == ['health_potion'] * 3
+    assert loaded.to_dict()['inventory'] == ['health_potion'] * 3
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_effects_compile_once():
+    """The same EFFECT string should give the same compiled operation"""
+    effect = compile_effect('health:20')
+    assert effect == ('health', 20, 'max_health')
+    assert compile_effect('health:20') is effect
+    with pytest.raises(InvalidDataFormatError):
+        compile_effect('luck:5')
+
+def test_using_several_potions_at_once():
+    """Batch use applies every item in one step, capped at max_health"""
+    char = {'inventory': ['health_potion'] * 4, 'health': 10, 'max_health': 100}
+    item_data = {'type': 'consumable', 'effect': 'health:20'}
+
+    inventory_system.use_item(char, 'health_potion', item_data, 3)
+    assert char['health'] == 70
+    assert char['inventory'].count('health_potion') == 1
+
+    inventory_system.use_item(char, 'health_potion', item_data)
+    inventory_system.add_item_to_inventory(char, 'health_potion', 2)
+    inventory_system.use_item(char, 'health_potion', item_data, 2)
+    assert char['health'] == 100
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.use_item(char, 'health_potion', item_data)
+
+    with pytest.raises(ValueError):
+        inventory_system.use_item(char, 'health_potion', item_data, -2)
+    assert char['health'] == 100
+    assert 'health_potion' not in char['inventory']
+
+def test_swapping_armor_undoes_old_bonus():
+    """Equipping new armor removes the old armor's bonus and returns it"""
+    char = character_manager.create_character("Armored", "Warrior")
+    inventory_system.add_item_to_inventory(char, 'steel_armor')
+    inventory_system.add_item_to_inventory(char, 'leather_armor')
+
+    inventory_system.equip_armor(char, 'steel_armor', {'type': 'armor', 'effect': 'max_health:25'})
+    char['health'] = char['max_health']
+    assert char['max_health'] == 125
+
+    inventory_system.equip_armor(char, 'leather_armor', {'type': 'armor', 'effect': 'max_health:10'})
+    assert char['max_health'] == 110
+    assert char['health'] == 100  # pulled down to the old max when unequipped
+    assert char['equipped_armor'] == 'leather_armor'
+    assert char['inventory'] == ['steel_armor']
+
+    assert inventory_system.unequip_item(char, 'equipped_armor') == 'leather_armor'
+    assert char['max_health'] == 100
+    assert 'equipped_armor' not in char
+
+# ============================================================================
+# SHOP TESTS
+# ============================================================================
+
+def test_shop_indexes():
+    """Shop should index items by type and price"""
+    store = Shop({
+        'potion': {'cost': 25, 'type': 'consumable'},
+        'sword': {'cost': 100, 'type': 'weapon'},
+        'elixir': {'cost': 50, 'type': 'consumable'},
+    })
+    assert store.items_of_type('consumable') == ['potion', 'elixir']
+    assert store.affordable(60) == ['potion', 'elixir']
+    assert store.sell_price('sword') == 50
+    with pytest.raises(ItemNotFoundError):
+        store.price('shield')
+
+def test_purchase_many_is_all_or_nothing():
+    """A batch purchase either fully applies or changes nothing"""
+    store = get_shop()
+    char = {'inventory': [], 'gold': 300}
+
+    spent = store.purchase_many(char, {'health_potion': 4, 'iron_sword': 1})
+    assert spent == 200
+    assert char['gold'] == 100
+    assert char['inventory'].count('health_potion') == 4
+
+    with pytest.raises(InsufficientResourcesError):
+        store.purchase_many(char, {'health_potion': 1, 'steel_sword': 1})
+    char['gold'] = 10_000
+    with pytest.raises(InventoryFullError):
+        store.purchase_many(char, {'iron_sword': inventory_system.MAX_INVENTORY})
+    assert char['gold'] == 10_000
+    assert len(char['inventory']) == 5
+
+    with pytest.raises(ItemNotFoundError):
+        store.sell_many(char, {'health_potion': 2, 'steel_sword': 1})
+    assert store.sell_many(char, {'health_potion': 2, 'iron_sword': 1}) == 2 * 12 + 50
+    assert char['inventory'] == ['health_potion'] * 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Test Quest System
+Tests quest state tracking, quest rewards and leveling
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import quest_handler
+from quest_log import QuestSet
+from leveling import LevelCurve
+
+QUESTS = {
+    'q1': {'quest_id': 'q1', 'required_level': 1, 'prerequisite': 'NONE',
+           'reward_xp': 30, 'reward_gold': 10},
+    'q2': {'quest_id': 'q2', 'required_level': 1, 'prerequisite': 'NONE',
+           'reward_xp': 90, 'reward_gold': 5},
+}
+
+# ============================================================================
+# QUEST LOG TESTS
+# ============================================================================
+
+def test_quest_set_behaves_like_list():
+    """QuestSet should keep insertion order and list-style methods"""
+    quests = QuestSet(['a', 'b'])
+    quests.append('c')
+    quests.append('a')  # already present
+    quests.remove('b')
+
+    assert quests == ['a', 'c']
+    assert 'c' in quests
+    assert len(quests) == 2
+    with pytest.raises(ValueError):
+        quests.remove('missing')
+
+def test_plain_list_quest_state_is_upgraded():
+    """Characters loaded with plain lists should still work"""
+    char = {'level': 1, 'active_quests': [], 'completed_quests': []}
+
+    quest_handler.accept_quest(char, 'q1', QUESTS)
+    quest_handler.abandon_quest(char, 'q1')
+
+    assert isinstance(char['active_quests'], QuestSet)
+    assert 'q1' not in char['active_quests']
+
+# ============================================================================
+# QUEST REWARD TESTS
+# ============================================================================
+
+def test_complete_quests_applies_rewards_once():
+    """Batch completion should sum rewards and level up once"""
+    char = character_manager.create_character("BatchTest", "Rogue")
+    char['active_quests'].extend(['q1', 'q2'])
+
+    summary = quest_handler.complete_quests(char, ['q1', 'q2'], QUESTS)
+
+    assert summary['xp'] == 120
+    assert summary['gold'] == 15
+    assert summary['levels_gained'] == 1
+    assert char['level'] == 2
+    assert char['experience'] == 20
+    assert char['completed_quests'] == ['q1', 'q2']
+
+def test_complete_quests_is_all_or_nothing():
+    """One inactive quest should leave the whole batch untouched"""
+    char = character_manager.create_character("BatchFail", "Rogue")
+    char['active_quests'].append('q1')
+
+    with pytest.raises(QuestNotActiveError):
+        quest_handler.complete_quests(char, ['q1', 'q2'], QUESTS)
+
+    assert 'q1' in char['active_quests']
+    assert char['experience'] == 0
+
+def test_quests_accepted_by_title_are_tracked_by_id():
+    """A title lookup must not let a quest be accepted or rewarded twice"""
+    char = character_manager.create_character("Titled", "Mage")
+    quest_handler.accept_quest(char, "First Steps", game_data.QUESTS)
+    assert char['active_quests'] == ['first_steps']
+    with pytest.raises(QuestAlreadyAcceptedError):
+        quest_handler.accept_quest(char, "first_steps", game_data.QUESTS)
+
+    summary = quest_handler.complete_quest(char, "First Steps", game_data.QUESTS)
+    assert summary['completed'] == ['first_steps']
+    with pytest.raises(QuestAlreadyCompletedError):
+        quest_handler.accept_quest(char, "first_steps", game_data.QUESTS)
+
+# ============================================================================
+# LEVELING TESTS
+# ============================================================================
+
+def test_level_curve_lookup():
+    """Curve should convert totals to levels inside and past the table"""
+    curve = LevelCurve([100, 200, 400])
+
+    assert curve.level_for(0) == (1, 0)
+    assert curve.level_for(299) == (2, 199)
+    assert curve.level_for(700) == (4, 0)
+    assert curve.level_for(700 + 400 * 3 + 5) == (7, 5)
+    assert curve.total_xp(7, 5) == 700 + 400 * 3 + 5
+
+def test_large_experience_grant_levels_in_one_step():
+    """A huge grant should apply every level and its stats at once"""
+    char = character_manager.create_character("BigGrant", "Warrior")
+    curve = character_manager.LEVEL_CURVE
+
+    levels = character_manager.gain_experience(char, 5_000_000)
+
+    assert levels == 5_000_000 // 100
+    assert char['level'] == 1 + levels
+    assert char['max_health'] == 100 + levels * curve.health_per_level
+    assert char['health'] == char['max_health']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,356 @@
+"""
+Test Save System
+Tests save backends, migration between them and character persistence
+"""
+
+import json
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+from save_backends import JSONSaveBackend, SQLiteSaveBackend, migrate
+from save_journal import COMPACT_EVERY
+from save_queue import SaveQueue
+from session_cache import SessionCache
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    """Point character_manager's default backend at a temporary directory"""
+    monkeypatch.setattr(character_manager, 'SAVE_DIR', str(tmp_path))
+    return tmp_path
+
+# ============================================================================
+# BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_round_trip_and_paging(tmp_path):
+    """SQLite saves should load back and list in sorted pages"""
+    backend = SQLiteSaveBackend(str(tmp_path / 'saves.db'))
+    backend.save_many([(f'Hero{i:02d}', {'name': f'Hero{i:02d}', 'gold': i}) for i in range(25)])
+    backend.save('Hero03', {'name': 'Hero03', 'gold': 99})
+
+    assert backend.load('Hero03') == {'name': 'Hero03', 'gold': 99}
+    first = backend.list_names(limit=10)
+    assert first == [f'Hero{i:02d}' for i in range(10)]
+    assert backend.list_names(after=first[-1], limit=10)[0] == 'Hero10'
+    assert len(backend.list_names()) == 25
+
+    backend.delete('Hero00')
+    assert not backend.exists('Hero00')
+    with pytest.raises(CharacterNotFoundError):
+        backend.load('Hero00')
+    with pytest.raises(CharacterNotFoundError):
+        backend.delete('Hero00')
+    backend.close()
+
+def test_migrate_json_saves_to_sqlite(tmp_path):
+    """Every legacy JSON save should be copied into the database"""
+    legacy = JSONSaveBackend(str(tmp_path / 'saves'))
+    for i in range(7):
+        legacy.save(f'Old{i}', {'name': f'Old{i}', 'level': i})
+
+    database = SQLiteSaveBackend(str(tmp_path / 'saves.db'))
+    assert migrate(legacy, database, batch_size=3) == 7
+    assert database.list_names() == legacy.list_names()
+    assert database.load('Old4') == {'name': 'Old4', 'level': 4}
+    database.close()
+
+def test_corrupted_json_save_raises(tmp_path):
+    """An unreadable legacy save should raise SaveFileCorruptedError"""
+    legacy = JSONSaveBackend(str(tmp_path))
+    (tmp_path / 'Broken.json').write_text('{"name": ')
+    with pytest.raises(SaveFileCorruptedError):
+        legacy.load('Broken')
+
+# ============================================================================
+# CHARACTER MANAGER TESTS
+# ============================================================================
+
+@pytest.mark.parametrize('data', [
+    {'name': 'Broken', 'level': 1},
+    ['Broken'],
+    {'name': 'Broken', 'class': 'Mage', 'level': 'x'},
+])
+def test_malformed_save_raises_corrupted(tmp_path, data):
+    """Saves that parse but do not describe a character are corrupted"""
+    character_manager.set_save_backend(JSONSaveBackend(str(tmp_path)))
+    try:
+        with open(tmp_path / 'Broken.json', 'w') as f:
+            json.dump(data, f)
+        with pytest.raises(SaveFileCorruptedError):
+            character_manager.load_character('Broken')
+    finally:
+        character_manager.set_save_backend(None)
+
+def test_character_manager_uses_chosen_backend(save_dir):
+    """Characters save to SQLite by default and to JSON when asked"""
+    char = character_manager.create_character("Saver", "Cleric")
+    character_manager.save_character(char)
+    assert (save_dir / character_manager.SAVE_DATABASE).exists()
+    assert character_manager.list_saved_characters() == ["Saver"]
+
+    character_manager.set_save_backend(JSONSaveBackend(str(save_dir / 'json')))
+    try:
+        character_manager.save_character(char)
+        assert (save_dir / 'json' / 'Saver.json').exists()
+        assert character_manager.load_character("Saver")['class'] == "Cleric"
+    finally:
+        character_manager.set_save_backend(None)
+
+    character_manager.delete_character("Saver")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Saver")
+
+# ============================================================================
+# ATOMIC AND WRITE-BEHIND SAVE TESTS
+# ============================================================================
+
+def test_failed_json_save_keeps_previous_file(tmp_path):
+    """A save that fails mid-write should leave the old save untouched"""
+    legacy = JSONSaveBackend(str(tmp_path))
+    legacy.save('Hero', {'name': 'Hero', 'gold': 5})
+    with pytest.raises(TypeError):
+        legacy.save('Hero', {'name': 'Hero', 'gold': object()})
+
+    assert legacy.load('Hero') == {'name': 'Hero', 'gold': 5}
+    assert os.listdir(tmp_path) == ['Hero.json']
+
+def test_save_queue_coalesces_and_reads_pending(tmp_path):
+    """Repeated saves are written once, and reads see queued data"""
+    database = SQLiteSaveBackend(str(tmp_path / 'saves.db'))
+    queue = SaveQueue(database, flush_interval=60)
+    for gold in range(3):
+        queue.save('Hero', {'name': 'Hero', 'gold': gold})
+    queue.save('Sidekick', {'name': 'Sidekick', 'gold': 1})
+
+    assert queue.load('Hero')['gold'] == 2
+    assert queue.list_names() == ['Hero', 'Sidekick']
+    assert not database.exists('Hero')
+
+    assert queue.flush() == 2
+    assert database.load('Hero')['gold'] == 2
+    assert (queue.saves_requested, queue.saves_written) == (4, 2)
+    queue.close()
+
+def test_save_queue_flushes_in_background(tmp_path):
+    """The flusher thread writes queued saves without an explicit flush"""
+    legacy = JSONSaveBackend(str(tmp_path))
+    queue = SaveQueue(legacy, flush_interval=0.01)
+    queue.save('Hero', {'name': 'Hero'})
+    for _ in range(200):
+        if legacy.exists('Hero'):
+            break
+        time.sleep(0.01)
+    assert legacy.exists('Hero')
+    queue.close()
+
+# ============================================================================
+# DELTA SAVE TESTS
+# ============================================================================
+
+def test_take_delta_holds_only_changes():
+    """A delta lists changed fields and item/quest changes, nothing else"""
+    char = character_manager.create_character("Delta", "Rogue")
+    assert char.take_delta() is None  # never saved: full save needed
+    assert char.take_delta() == {}
+
+    char['gold'] += 5
+    char['completed_quests'].append('first_steps')
+    char['inventory'].add('health_potion', 2)
+    char['equipped_weapon'] = 'iron_sword'
+    del char['equipped_weapon']
+
+    assert char.take_delta() == {
+        'set': {'gold': character_manager.STARTING_GOLD + 5},
+        'unset': ['equipped_weapon'],
+        'quests': {'completed_quests': [('+', 'first_steps')]},
+        'items': {'inventory': {'health_potion': 2}},
+    }
+    assert char.take_delta() == {}
+
+def test_renamed_character_saves_in_full(save_dir):
+    """Saving under a new name must not append a delta to another character"""
+    a = character_manager.create_character("A", "Warrior")
+    a['gold'] = 999
+    character_manager.save_character(a)
+    character_manager.save_character(character_manager.create_character("B", "Mage"))
+
+    a['name'] = 'B'
+    character_manager.save_character(a)
+    saved = character_manager.get_save_backend().load('B')
+    assert (saved['class'], saved['gold']) == ('Warrior', 999)
+
+@pytest.mark.parametrize('make_backend', [
+    lambda path: JSONSaveBackend(str(path)),
+    lambda path: SQLiteSaveBackend(str(path / 'saves.db')),
+])
+def test_journal_replays_and_compacts(tmp_path, make_backend):
+    """Loads replay the journal; COMPACT_EVERY deltas fold into the snapshot"""
+    backend = make_backend(tmp_path)
+    character_manager.set_save_backend(backend)
+    try:
+        char = character_manager.create_character("Journal", "Mage")
+        character_manager.save_character(char)
+        for _ in range(COMPACT_EVERY - 1):
+            char['gold'] += 1
+            character_manager.save_character(char)
+        char['active_quests'].append('first_steps')
+        char['inventory'].add('health_potion', 3)
+        character_manager.save_character(char)
+        assert backend.journal_lengths['Journal'] == 0  # compacted
+
+        char['inventory'].remove('health_potion')
+        character_manager.save_character(char)
+        assert backend.journal_lengths['Journal'] == 1
+
+        character_manager.get_session_cache().clear()
+        loaded = character_manager.load_character("Journal")
+        assert loaded is not char
+        assert loaded.to_dict() == char.to_dict()
+    finally:
+        character_manager.set_save_backend(None)
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    """A delta cut off by a crash mid-append is treated as never written"""
+    legacy = JSONSaveBackend(str(tmp_path))
+    legacy.save('Hero', {'name': 'Hero', 'gold': 1})
+    legacy.append_delta('Hero', {'set': {'gold': 2}})
+    with open(tmp_path / 'Hero.journal', 'a') as f:
+        f.write('{"set": {"gold"')
+    assert legacy.load('Hero')['gold'] == 2
+
+def test_save_queue_folds_deltas(tmp_path):
+    """Queued deltas are readable before flushing and written in order"""
+    database = SQLiteSaveBackend(str(tmp_path / 'saves.db'))
+    database.save('Hero', {'name': 'Hero', 'gold': 1, 'completed_quests': []})
+    queue = SaveQueue(database, flush_interval=60)
+    queue.append_delta('Hero', {'set': {'gold': 2}})
+    queue.append_delta('Hero', {'quests': {'completed_quests': [('+', 'q1')]}})
+
+    assert queue.load('Hero') == {'name': 'Hero', 'gold': 2, 'completed_quests': ['q1']}
+    with pytest.raises(CharacterNotFoundError):
+        queue.append_delta('Nobody', {'set': {'gold': 1}})
+    queue.flush()
+    assert database.load('Hero') == {'name': 'Hero', 'gold': 2, 'completed_quests': ['q1']}
+    queue.close()
+
+def test_save_queue_isolates_bad_saves(save_dir, tmp_path):
+    """A save that cannot be written must not hold back the others"""
+    bad = character_manager.create_character("Bad", "Rogue")
+    bad['tags'] = {'x'}
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.save_character(bad)
+    assert character_manager.save_character(character_manager.create_character("Good", "Rogue"))
+    character_manager.flush_saves()
+    assert character_manager.get_save_backend().backend.exists("Good")
+
+    class Flaky(JSONSaveBackend):
+        def save_many(self, records):
+            if any(name == 'Broken' for name, _ in records):
+                raise OSError("disk full")
+            super().save_many(records)
+
+    queue = SaveQueue(Flaky(str(tmp_path / 'flaky')), flush_interval=60)
+    queue.save('Broken', {'name': 'Broken'})
+    queue.save('Fine', {'name': 'Fine'})
+    with pytest.raises(SaveFileCorruptedError):
+        queue.flush()
+    assert queue.backend.exists('Fine')
+    assert list(queue.pending) == ['Broken']
+    queue.pending.clear()
+    queue.close()
+
+# ============================================================================
+# SESSION CACHE TESTS
+# ============================================================================
+
+def test_session_cache_serves_hot_characters(save_dir, monkeypatch):
+    """Loading a cached character should not touch the save backend"""
+    char = character_manager.create_character("Hot", "Warrior")
+    character_manager.save_character(char)
+    cache = character_manager.get_session_cache()
+    hits = cache.hits
+
+    def no_reads(name):
+        raise AssertionError("backend read")
+    monkeypatch.setattr(character_manager.get_save_backend(), 'load', no_reads)
+    assert character_manager.load_character("Hot") is char
+    assert cache.hits == hits + 1
+
+def test_session_cache_follows_save_dir(tmp_path, monkeypatch):
+    """Pointing SAVE_DIR somewhere else should not serve cached characters"""
+    monkeypatch.setattr(character_manager, 'SAVE_DIR', str(tmp_path / 'one'))
+    character_manager.save_character(character_manager.create_character("A", "Mage"))
+    monkeypatch.setattr(character_manager, 'SAVE_DIR', str(tmp_path / 'two'))
+
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("A")
+    assert character_manager.list_saved_characters() == []
+
+def test_session_cache_drops_stale_names(save_dir):
+    """Renames and non-Character saves must not leave stale cache entries"""
+    bob = character_manager.create_character("Bob", "Warrior")
+    character_manager.save_character(bob)
+    bob['name'] = "Robert"
+    character_manager.save_character(bob)
+    assert character_manager.load_character("Robert") is bob
+    old_bob = character_manager.load_character("Bob")
+    assert old_bob is not bob and old_bob['name'] == "Bob"
+
+    data = old_bob.to_dict()
+    data['gold'] = 777
+    character_manager.save_character(data)
+    assert character_manager.load_character("Bob")['gold'] == 777
+
+def test_session_cache_evicts_least_recently_used():
+    """Over the entry limit the least recently used character goes first"""
+    cache = SessionCache(max_entries=2)
+    chars = {name: character_manager.create_character(name, "Mage") for name in "ABC"}
+    cache.put('A', chars['A'])
+    cache.put('B', chars['B'])
+    assert cache.get('A') is chars['A']
+    cache.put('C', chars['C'])
+
+    assert 'B' not in cache and 'A' in cache and 'C' in cache
+    assert cache.get('B') is None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['misses'] == 1
+
+    small = SessionCache(memory_budget=1)
+    small.put('A', chars['A'])
+    small.put('B', chars['B'])
+    assert len(small) == 1 and small.memory_used > 1
+
+def test_session_cache_saves_dirty_characters_on_eviction(tmp_path):
+    """Evicting a character with unsaved changes should save it first"""
+    backend = JSONSaveBackend(str(tmp_path))
+    character_manager.set_save_backend(backend)
+    character_manager.set_session_cache(SessionCache(max_entries=1))
+    try:
+        first = character_manager.create_character("First", "Rogue")
+        character_manager.save_character(first)
+        first['gold'] = 500
+        first['inventory'].add('health_potion')
+        assert character_manager.get_session_cache().dirty() == ['First']
+
+        character_manager.save_character(character_manager.create_character("Second", "Rogue"))
+        assert 'First' not in character_manager.get_session_cache()
+        assert backend.load('First')['gold'] == 500
+        assert backend.load('First')['inventory'] == ['health_potion']
+        assert not first.has_changes()
+
+        character_manager.delete_character('Second')
+        with pytest.raises(CharacterNotFoundError):
+            character_manager.load_character('Second')
+    finally:
+        character_manager.set_session_cache(
+            SessionCache(character_manager.SESSION_CACHE_ENTRIES, character_manager.SESSION_CACHE_BUDGET))
+        character_manager.set_save_backend(None)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])